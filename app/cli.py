@@ -0,0 +1,184 @@
+"""Offline bulk scorer for directories of resume PDFs and Word documents.
+
+Usage:
+    python -m app.cli /path/to/resumes -o results.jsonl
+    python -m app.cli /path/to/resumes -o results.csv --workers 8
+
+Files already recorded in the output are skipped, so an interrupted run
+picks up where it stopped when started again with the same output file.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, Optional, Set
+from app import config
+from app.services.document import DocumentError, DocumentTooLargeError, detect_file_format, parse_docx, parse_document
+from app.services.extraction import BACKENDS
+from app.services.grammar import grammar_pool
+from app.services.ocr import ocr_engine
+from app.services.pipeline import detailed_response
+from app.services.resume_service import analyze_resume, get_detailed_scores
+
+SCORE_COLUMNS = [
+    "total_final_score",
+    "grammar_final_score",
+    "action_final_score",
+    "ats_final_score",
+    "keywords_final_score",
+    "page_length_final_score"
+]
+CSV_COLUMNS = ["path", "status", "job_profile"] + SCORE_COLUMNS + ["error"]
+
+
+def find_documents(root: str) -> Iterator[str]:
+    """Walk a directory tree and yield PDF and DOCX paths relative to it, in a stable order.
+
+    Files are recognized by their content, whatever their name or extension.
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            try:
+                if detect_file_format(path) is None:
+                    continue
+            except DocumentTooLargeError:
+                # Scored anyway, so the file is reported as too large
+                pass
+            yield os.path.relpath(path, root)
+
+
+def completed_paths(output_path: str, output_format: str) -> Set[str]:
+    """Paths already recorded in an existing output file"""
+    if not os.path.exists(output_path):
+        return set()
+
+    with open(output_path, newline="") as output:
+        if output_format == "csv":
+            return {row["path"] for row in csv.DictReader(output)}
+
+        done = set()
+        for line in output:
+            try:
+                done.add(json.loads(line)["path"])
+            except (ValueError, KeyError):
+                # A line cut short by an interruption; the file is scored again
+                continue
+        return done
+
+
+def score_file(root: str, path: str, backend: Optional[str] = None) -> Dict:
+    """Run the detailed analysis for one PDF or DOCX"""
+    try:
+        source = os.path.join(root, path)
+        max_pages = config.EXTRACT_MAX_PAGES or None
+        document_format = detect_file_format(source)
+        if document_format == "docx":
+            document = parse_docx(source, max_pages)
+        elif document_format == "pdf":
+            document = ocr_engine.apply(parse_document(source, backend, max_pages), source)
+        else:
+            raise DocumentError("Not a PDF or DOCX file")
+        basic_analysis = analyze_resume(document)
+        detailed_scores = get_detailed_scores(document, basic_analysis)
+        return {"path": path, "status": "ok", **detailed_response(basic_analysis, detailed_scores)}
+    except Exception as e:
+        return {"path": path, "status": "error", "error": getattr(e, "detail", None) or str(e)}
+
+
+def csv_row(record: Dict) -> Dict:
+    """Flatten a result record into the CSV columns"""
+    row = {"path": record["path"], "status": record["status"], "error": record.get("error", "")}
+    if record["status"] == "ok":
+        row["job_profile"] = record["analysis_details"].get("job_profile", "")
+        row.update({column: record["detailed_scores"][column] for column in SCORE_COLUMNS})
+    return row
+
+
+def _use_language_tool_server(server_url: Optional[str]):
+    """Point the grammar checks of a worker process at the parent's LanguageTool server"""
+    if server_url:
+        grammar_pool.remote_server = server_url
+
+
+def run(root: str, output_path: str, output_format: str, workers: int, backend: Optional[str] = None) -> int:
+    """Score every new resume under root and append the results to output_path"""
+    done = completed_paths(output_path, output_format)
+    todo = (path for path in find_documents(root) if path not in done)
+    write_header = output_format == "csv" and (not os.path.exists(output_path) or os.path.getsize(output_path) == 0)
+
+    # One LanguageTool server in this process is shared by every worker, instead of
+    # each worker starting LANGUAGE_TOOL_POOL_SIZE JVMs of its own
+    try:
+        server_url = grammar_pool.server_url()
+    except Exception as e:
+        print(f"LanguageTool could not be started: {e}", file=sys.stderr)
+        server_url = None
+
+    processed = 0
+    try:
+        processed = _score_all(todo, root, output_path, output_format, workers, backend, write_header, server_url)
+    finally:
+        grammar_pool.close()
+    return processed
+
+
+def _score_all(todo: Iterator[str], root: str, output_path: str, output_format: str, workers: int,
+               backend: Optional[str], write_header: bool, server_url: Optional[str]) -> int:
+    processed = 0
+    pool = ProcessPoolExecutor(
+        max_workers=workers, initializer=_use_language_tool_server, initargs=(server_url,)
+    )
+    with open(output_path, "a", newline="") as output, pool:
+        writer = csv.DictWriter(output, fieldnames=CSV_COLUMNS) if output_format == "csv" else None
+        if write_header:
+            writer.writeheader()
+
+        pending = set()
+        for path in todo:
+            # Keep a bounded window of submitted files so huge archives stay cheap to walk
+            if len(pending) >= workers * 4:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                processed += _write_results(finished, output, writer)
+            pending.add(pool.submit(score_file, root, path, backend))
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            processed += _write_results(finished, output, writer)
+
+    return processed
+
+
+def _write_results(finished, output, writer) -> int:
+    for future in finished:
+        record = future.result()
+        if writer is not None:
+            writer.writerow(csv_row(record))
+        else:
+            output.write(json.dumps(record) + "\n")
+        print(f"{record['status']}: {record['path']}", file=sys.stderr)
+    output.flush()
+    return len(finished)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a directory tree of resume PDFs and DOCX files")
+    parser.add_argument("directory", help="Directory searched recursively for PDF and DOCX files")
+    parser.add_argument("-o", "--output", required=True, help="JSONL or CSV file to append results to")
+    parser.add_argument("--format", choices=["jsonl", "csv"],
+                        help="Output format (default: from the output file extension)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: all cores)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS),
+                        help="PDF extraction backend (default: RESUME_EXTRACTION_BACKEND)")
+    args = parser.parse_args(argv)
+
+    output_format = args.format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+    processed = run(args.directory, args.output, output_format, max(1, args.workers), args.backend)
+    print(f"Scored {processed} file(s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import os
+
+
+def _int_env(name: str, default: int) -> int:
+    """Read an integer setting from the environment"""
+    return int(os.getenv(name, default))
+
+
+# Worker pools used to keep analysis off the event loop.
+# RESUME_PROCESS_WORKERS=0 runs CPU-bound work on the thread pool instead.
+THREAD_WORKERS = _int_env("RESUME_THREAD_WORKERS", 4)
+PROCESS_WORKERS = _int_env("RESUME_PROCESS_WORKERS", os.cpu_count() or 1)
+
+# Requests allowed in flight before the API answers 503
+MAX_QUEUE_DEPTH = _int_env("RESUME_MAX_QUEUE_DEPTH", 32)
+RETRY_AFTER_SECONDS = _int_env("RESUME_RETRY_AFTER_SECONDS", 5)
+
+# Uploads larger than this are spilled to a temporary file before parsing
+SPILL_TO_DISK_BYTES = _int_env("RESUME_SPILL_TO_DISK_BYTES", 10 * 1024 * 1024)
+
+# Result cache: in-process LRU tier plus an optional SQLite tier (empty path disables it)
+CACHE_MAX_ENTRIES = _int_env("RESUME_CACHE_MAX_ENTRIES", 1024)
+CACHE_TTL_SECONDS = _int_env("RESUME_CACHE_TTL_SECONDS", 24 * 60 * 60)
+CACHE_DB_PATH = os.getenv("RESUME_CACHE_DB_PATH", "")
+
+# Background jobs: analyses run at once per process, how long finished jobs are kept,
+# and an optional SQLite file that lets every worker process answer polls (empty keeps jobs in memory)
+JOB_CONCURRENCY = _int_env("RESUME_JOB_CONCURRENCY", 8)
+JOB_TTL_SECONDS = _int_env("RESUME_JOB_TTL_SECONDS", 60 * 60)
+JOB_STORE_PATH = os.getenv("RESUME_JOB_STORE_PATH", "")
+
+# Batch analysis: files analyzed concurrently per batch and files accepted per request
+BATCH_CONCURRENCY = _int_env("RESUME_BATCH_CONCURRENCY", 8)
+BATCH_MAX_FILES = _int_env("RESUME_BATCH_MAX_FILES", 10000)
+
+# LanguageTool grammar checking. LANGUAGE_TOOL_SERVER points the pool at an
+# already running LanguageTool HTTP server instead of starting local JVMs.
+LANGUAGE_TOOL_LANGUAGE = os.getenv("LANGUAGE_TOOL_LANGUAGE", "en-US")
+LANGUAGE_TOOL_POOL_SIZE = _int_env("LANGUAGE_TOOL_POOL_SIZE", 2)
+LANGUAGE_TOOL_SERVER = os.getenv("LANGUAGE_TOOL_SERVER", "")
+LANGUAGE_TOOL_CHECKOUT_TIMEOUT = _int_env("LANGUAGE_TOOL_CHECKOUT_TIMEOUT", 30)
+LANGUAGE_TOOL_HEALTH_CHECK_SECONDS = _int_env("LANGUAGE_TOOL_HEALTH_CHECK_SECONDS", 60)
+
+# Chunked grammar checking: characters per LanguageTool request and memoized sentences
+GRAMMAR_CHUNK_CHARS = _int_env("GRAMMAR_CHUNK_CHARS", 3000)
+GRAMMAR_MEMO_SIZE = _int_env("GRAMMAR_MEMO_SIZE", 20000)
+
+# Components loaded at startup instead of on first use, e.g. "language_tool,spacy"
+WARM_UP_COMPONENTS = [name.strip() for name in os.getenv("RESUME_WARM_UP", "").split(",") if name.strip()]
+
+# Components loaded once in the gunicorn master before forking workers (see app/gunicorn_conf.py)
+PRELOAD_COMPONENTS = [name.strip() for name in os.getenv("RESUME_PRELOAD", "language_tool").split(",") if name.strip()]
+
+# Page previews: default resolution, pages rendered per request and rendered-page cache size
+PREVIEW_DEFAULT_DPI = _int_env("PREVIEW_DEFAULT_DPI", 110)
+PREVIEW_MAX_DPI = _int_env("PREVIEW_MAX_DPI", 300)
+PREVIEW_MAX_PAGES = _int_env("PREVIEW_MAX_PAGES", 10)
+PREVIEW_THUMBNAIL_WIDTH = _int_env("PREVIEW_THUMBNAIL_WIDTH", 200)
+PREVIEW_CACHE_BYTES = _int_env("PREVIEW_CACHE_BYTES", 64 * 1024 * 1024)
+PREVIEW_DOCUMENT_STORE_BYTES = _int_env("PREVIEW_DOCUMENT_STORE_BYTES", 128 * 1024 * 1024)
+# Directory shared by all worker processes for PDFs stored for per-page previews (empty keeps them in memory)
+PREVIEW_DOCUMENT_DIR = os.getenv("PREVIEW_DOCUMENT_DIR", "")
+
+# PDF text extraction: backend used unless a request picks one ("pymupdf", "pdfplumber" or
+# "pypdf2"), then the backends tried in order when it fails or returns empty or garbled text
+EXTRACTION_BACKEND = os.getenv("RESUME_EXTRACTION_BACKEND", "pymupdf")
+EXTRACTION_FALLBACKS = [
+    name.strip() for name in os.getenv("RESUME_EXTRACTION_FALLBACKS", "pypdf2,pdfplumber").split(",") if name.strip()
+]
+
+# Documents with more pages than this are extracted in parallel, this many pages per
+# process-pool task (0 always extracts in one task)
+EXTRACTION_PAGES_PER_TASK = _int_env("RESUME_EXTRACTION_PAGES_PER_TASK", 8)
+# Extract and analyze only the first N pages of each document (0 extracts every page)
+EXTRACT_MAX_PAGES = _int_env("RESUME_EXTRACT_MAX_PAGES", 0)
+
+# OCR of scanned pages with Tesseract: threads in the OCR pool (0 disables OCR), language,
+# render resolution, pages with fewer non-space characters than this that are sent to OCR,
+# most pages read per document, seconds per page and memory for cached page text
+OCR_WORKERS = _int_env("RESUME_OCR_WORKERS", 2)
+OCR_LANGUAGE = os.getenv("RESUME_OCR_LANGUAGE", "eng")
+OCR_DPI = _int_env("RESUME_OCR_DPI", 300)
+OCR_MIN_CHARS_PER_PAGE = _int_env("RESUME_OCR_MIN_CHARS_PER_PAGE", 50)
+OCR_MAX_PAGES = _int_env("RESUME_OCR_MAX_PAGES", 10)
+OCR_TIMEOUT_SECONDS = _int_env("RESUME_OCR_TIMEOUT_SECONDS", 30)
+OCR_CACHE_BYTES = _int_env("RESUME_OCR_CACHE_BYTES", 8 * 1024 * 1024)
+# Documents waiting for or in OCR; more are answered with 503. They give back their
+# analysis queue and job slots while they wait, so scanned uploads cannot starve the rest
+OCR_MAX_QUEUE = _int_env("RESUME_OCR_MAX_QUEUE", 8)
+
+# Upload limits: bytes per file, bytes per request body and pages per document
+MAX_UPLOAD_BYTES = _int_env("RESUME_MAX_UPLOAD_BYTES", 20 * 1024 * 1024)
+MAX_REQUEST_BYTES = _int_env("RESUME_MAX_REQUEST_BYTES", MAX_UPLOAD_BYTES + 64 * 1024)
+# Word documents are zip packages; this caps their size once unpacked, so small zip bombs are refused
+MAX_DOCX_UNPACKED_BYTES = _int_env("RESUME_MAX_DOCX_UNPACKED_BYTES", 100 * 1024 * 1024)
+BATCH_MAX_REQUEST_BYTES = _int_env("RESUME_BATCH_MAX_REQUEST_BYTES", 1024 * 1024 * 1024)
+MAX_PAGES = _int_env("RESUME_MAX_PAGES", 50)
+UPLOAD_CHUNK_BYTES = 64 * 1024
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import zipfile
+import zlib
+from typing import AsyncIterator, Dict, Optional, Tuple, Union
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.datastructures import UploadFile
+from app import config
+from app.services.executor import analysis_executor
+from app.services.extraction import BackendName
+from app.services.document import DocumentTooLargeError, detect_format
+from app.services.ingest import read_upload, too_large, unsupported_format
+from app.services.pipeline import detailed_analysis
+
+router = APIRouter()
+
+DOCUMENT_EXTENSIONS = (".pdf", ".docx")
+
+
+async def _form_items(form) -> AsyncIterator[Tuple[str, Union[bytes, HTTPException]]]:
+    """Yield the name and bytes of each resume in a batch request, one at a time.
+
+    Files that fail the upload checks are yielded with the rejection instead
+    of their bytes, so they are reported without stopping the batch.
+    """
+    for upload in form.getlist("files"):
+        if isinstance(upload, UploadFile):
+            try:
+                yield upload.filename, await read_upload(upload)
+            except HTTPException as e:
+                yield upload.filename, e
+
+    for archive in form.getlist("archive"):
+        if not isinstance(archive, UploadFile):
+            continue
+        try:
+            zip_file = zipfile.ZipFile(archive.file)
+        except zipfile.BadZipFile:
+            yield archive.filename, HTTPException(status_code=400, detail="Invalid zip archive.")
+            continue
+
+        with zip_file:
+            for info in zip_file.infolist():
+                name = info.filename
+                if info.is_dir() or name.startswith("__MACOSX/"):
+                    continue
+                # Members are recognized by content; other files are skipped, but members
+                # named like resumes are reported when they are too large or not what they claim
+                named_resume = name.lower().endswith(DOCUMENT_EXTENSIONS)
+                # Checked before decompressing, so oversized members are never inflated
+                if info.file_size > config.MAX_UPLOAD_BYTES:
+                    if named_resume:
+                        yield name, too_large(config.MAX_UPLOAD_BYTES)
+                    continue
+                try:
+                    content = await asyncio.to_thread(zip_file.read, name)
+                except (zipfile.BadZipFile, zlib.error, RuntimeError, NotImplementedError, EOFError) as e:
+                    # Corrupt, encrypted or unsupported members fail on their own
+                    yield name, HTTPException(status_code=400, detail=f"Unreadable archive member: {e}")
+                    continue
+                try:
+                    document_format = detect_format(content)
+                except DocumentTooLargeError as e:
+                    yield name, HTTPException(status_code=413, detail=str(e))
+                    continue
+                if document_format is not None:
+                    yield name, content
+                elif named_resume:
+                    yield name, unsupported_format()
+
+
+async def _analyze_item(index: int, filename: str, content: Union[bytes, HTTPException],
+                        backend: Optional[str]) -> Dict:
+    try:
+        if isinstance(content, HTTPException):
+            raise content
+        result = await detailed_analysis(content, admitted=True, backend=backend)
+        return {"index": index, "filename": filename, "status": "ok", "result": result}
+    except Exception as e:
+        detail = getattr(e, "detail", None) or str(e)
+        return {"index": index, "filename": filename, "status": "error", "detail": detail}
+
+
+async def _stream_results(form, backend: Optional[str]) -> AsyncIterator[str]:
+    """Analyze batch items with bounded concurrency and yield NDJSON lines as they finish"""
+    pending = set()
+    try:
+        index = 0
+        async for filename, content in _form_items(form):
+            if len(pending) >= config.BATCH_CONCURRENCY:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield json.dumps(task.result()) + "\n"
+            pending.add(asyncio.ensure_future(_analyze_item(index, filename, content, backend)))
+            index += 1
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield json.dumps(task.result()) + "\n"
+    finally:
+        for task in pending:
+            task.cancel()
+        await form.close()
+        analysis_executor.release()
+
+
+@router.post("/analyze-batch")
+async def batch_resume_analysis(request: Request, backend: Optional[BackendName] = Query(None)):
+    """
+    Detailed analysis of many resumes in one request
+    Accepts multipart form data with any number of `files` (PDF or DOCX)
+    and/or `archive` zip files of them. Each result is streamed back as one
+    NDJSON line as soon as it is ready, in completion order; `index`
+    gives the position of the file in the submission.
+    """
+    form = await request.form(max_files=config.BATCH_MAX_FILES)
+    if not form.getlist("files") and not form.getlist("archive"):
+        await form.close()
+        raise HTTPException(
+            status_code=400,
+            detail="No files submitted. Send resumes as 'files' or a zip as 'archive'."
+        )
+
+    try:
+        analysis_executor.acquire()
+    except Exception:
+        await form.close()
+        raise
+    return StreamingResponse(_stream_results(form, backend), media_type="application/x-ndjson")
@@ -0,0 +1,84 @@
+from typing import Optional
+from fastapi import APIRouter, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import JSONResponse
+from app.services import pipeline  # noqa: F401  registers the job kinds
+from app.services.extraction import BackendName
+from app.services.ingest import read_upload
+from app.services.jobs import ACTIVE_STATUSES, DONE, JobNotFoundError, job_queue
+from app.services.metrics import json_response
+
+router = APIRouter()
+
+# Seconds clients are asked to wait between polls of an unfinished job
+POLL_AFTER_SECONDS = 2
+
+
+def _public(job: dict, request: Request) -> dict:
+    """Job record as returned to clients, without the result payload"""
+    return {
+        "job_id": job["job_id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "created": job["created"],
+        "updated": job["updated"],
+        "error": job["error"],
+        "status_url": str(request.url_for("job_status", job_id=job["job_id"])),
+        "result_url": str(request.url_for("job_result", job_id=job["job_id"]))
+    }
+
+
+async def _job(job_id: str) -> dict:
+    try:
+        return await job_queue.get(job_id)
+    except JobNotFoundError:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+
+
+@router.post("/jobs", status_code=202)
+async def submit_job(request: Request, file: UploadFile = File(...),
+                     kind: str = Query("analyze-resume"),
+                     top_n: int = Query(5, ge=1, le=50),
+                     backend: Optional[BackendName] = Query(None)):
+    """Queue an analysis and return immediately with the job id to poll"""
+    if kind not in job_queue.kinds:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown job kind. Use one of: {', '.join(job_queue.kinds)}."
+        )
+    content = await read_upload(file)
+
+    params = {"top_n": top_n} if kind == "match-profiles" else {}
+    params["backend"] = backend
+    job_id = await job_queue.submit(kind, content, **params)
+    job = _public(await job_queue.get(job_id), request)
+    return JSONResponse(status_code=202, content=job, headers={"Location": job["status_url"]})
+
+
+@router.get("/jobs/{job_id}", name="job_status")
+async def job_status(job_id: str, request: Request):
+    """Status of a job"""
+    return _public(await _job(job_id), request)
+
+
+@router.get("/jobs/{job_id}/result", name="job_result")
+async def job_result(job_id: str, request: Request):
+    """Result of a finished job; 202 while it is still queued or running"""
+    job = await _job(job_id)
+    if job["status"] in ACTIVE_STATUSES:
+        return JSONResponse(
+            status_code=202,
+            content=_public(job, request),
+            headers={"Retry-After": str(POLL_AFTER_SECONDS)}
+        )
+    if job["status"] != DONE:
+        raise HTTPException(status_code=job["status_code"] or 500, detail=job["error"])
+    return json_response(job["result"])
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str, request: Request):
+    """Cancel a queued or running job"""
+    try:
+        return _public(await job_queue.cancel(job_id), request)
+    except JobNotFoundError:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
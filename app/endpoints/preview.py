@@ -0,0 +1,156 @@
+import base64
+import json
+from typing import Dict, List, Optional
+from fastapi import APIRouter, File, Header, HTTPException, Query, Request, UploadFile
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from app import config
+from app.services.executor import analysis_executor
+from app.services.ingest import read_upload
+from app.services.preview import (
+    IMAGE_FORMATS,
+    PageNotFoundError,
+    PreviewError,
+    cache_key,
+    count_pages,
+    document_hash,
+    document_store,
+    etag,
+    page_cache,
+    render_page,
+    select_pages
+)
+from app.services.storage import call_store
+
+router = APIRouter()
+
+
+async def _render(content: bytes, doc_hash: str, page: int, dpi: int, width: Optional[int]) -> Dict:
+    """Render one page through the page cache and encode it as a data URI"""
+    key = cache_key(doc_hash, page, dpi, width)
+    image = page_cache.get(key)
+    if image is None:
+        image = await analysis_executor.run_cpu(render_page, content, page, dpi, width)
+        page_cache.set(key, image)
+    img_base64 = base64.b64encode(image).decode("utf-8")
+    return {"page": page, "image": f"data:image/jpeg;base64,{img_base64}"}
+
+
+async def _stream_pages(content: bytes, doc_hash: str, pages: List[int], dpi: int, width: Optional[int]):
+    try:
+        for page in pages:
+            try:
+                line = await _render(content, doc_hash, page, dpi, width)
+            except PreviewError as e:
+                line = {"page": page, "error": str(e)}
+            yield json.dumps(line) + "\n"
+    finally:
+        analysis_executor.release()
+
+
+@router.post("/preview/")
+async def generate_preview(
+    file: UploadFile = File(...),
+    pages: Optional[str] = Query(None, description='Pages to render, e.g. "1-3,5"'),
+    dpi: int = Query(config.PREVIEW_DEFAULT_DPI, ge=20, le=config.PREVIEW_MAX_DPI),
+    width: Optional[int] = Query(None, ge=16, le=4000, description="Target width in pixels; overrides dpi"),
+    thumbnail: bool = Query(False, description="Only a small image of the first page"),
+    stream: bool = Query(False, description="Stream one NDJSON line per page as it is rendered")
+):
+    """Render page previews of a PDF as JPEG data URIs"""
+    pdf_data = await read_upload(file, formats=("pdf",))
+    doc_hash = document_hash(pdf_data)
+    if thumbnail:
+        pages = "1"
+        width = width or config.PREVIEW_THUMBNAIL_WIDTH
+
+    analysis_executor.acquire()
+    try:
+        page_count = await analysis_executor.run_cpu(count_pages, pdf_data)
+        selected = select_pages(pages, page_count, config.PREVIEW_MAX_PAGES)
+    except PreviewError as e:
+        analysis_executor.release()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        analysis_executor.release()
+        raise
+
+    if stream:
+        return StreamingResponse(
+            _stream_pages(pdf_data, doc_hash, selected, dpi, width),
+            media_type="application/x-ndjson",
+            headers={"X-Page-Count": str(page_count)}
+        )
+
+    try:
+        preview_images = [await _render(pdf_data, doc_hash, page, dpi, width) for page in selected]
+    except PreviewError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        analysis_executor.release()
+
+    return JSONResponse(content={"page_count": page_count, "preview_images": preview_images})
+
+
+@router.post("/preview/documents")
+async def register_preview_document(request: Request, file: UploadFile = File(...)):
+    """
+    Store a PDF for per-page preview requests
+    Returns the document hash and one image URL per page. Pages are fetched
+    lazily as raw image bytes that browsers and CDNs can cache.
+    """
+    pdf_data = await read_upload(file, formats=("pdf",))
+    async with analysis_executor.slot():
+        try:
+            page_count = await analysis_executor.run_cpu(count_pages, pdf_data)
+        except PreviewError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    doc_hash = document_hash(pdf_data)
+    await call_store(document_store.set, doc_hash, pdf_data)
+    return {
+        "document_hash": doc_hash,
+        "page_count": page_count,
+        "pages": [
+            str(request.url_for("preview_page_image", doc_hash=doc_hash, page=page))
+            for page in range(1, page_count + 1)
+        ]
+    }
+
+
+@router.get("/preview/{doc_hash}/pages/{page}", name="preview_page_image")
+async def preview_page_image(
+    doc_hash: str,
+    page: int,
+    image_format: str = Query("jpeg", alias="format", pattern="^(jpeg|webp)$"),
+    dpi: int = Query(config.PREVIEW_DEFAULT_DPI, ge=20, le=config.PREVIEW_MAX_DPI),
+    width: Optional[int] = Query(None, ge=16, le=4000),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Raw JPEG or WebP bytes of one page of a document stored via /preview/documents"""
+    key = cache_key(doc_hash, page, dpi, width, image_format)
+    headers = {
+        "ETag": etag(key),
+        # Content-addressed: the image for this URL never changes
+        "Cache-Control": "public, max-age=31536000, immutable"
+    }
+    if if_none_match == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    image = page_cache.get(key)
+    if image is None:
+        pdf_data = await call_store(document_store.get, doc_hash)
+        if pdf_data is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Unknown document. Upload it again via /preview/documents."
+            )
+        async with analysis_executor.slot():
+            try:
+                image = await analysis_executor.run_cpu(render_page, pdf_data, page, dpi, width, image_format)
+            except PageNotFoundError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            except PreviewError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        page_cache.set(key, image)
+
+    return Response(content=image, media_type=IMAGE_FORMATS[image_format], headers=headers)
@@ -1,37 +1,57 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException
-import tempfile
-import os
-from app.services.resume_service import analyze_resume, get_detailed_scores
+import json
+from typing import Optional
+from fastapi import APIRouter, File, UploadFile, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.services.cache import result_cache
+from app.services.document import DocumentError, DocumentTooLargeError
+from app.services.executor import QueueFullError, analysis_executor
+from app.services.extraction import BackendName
+from app.services.ingest import read_upload
+from app.services.jobs import job_queue
+from app.services.metrics import json_response
+from app.services.pipeline import progressive_analysis
 
 router = APIRouter()
 
 @router.post("/upload")
-async def upload_and_analyze(file: UploadFile = File(...)):
+async def upload_and_analyze(file: UploadFile = File(...), backend: Optional[BackendName] = Query(None)):
     """Basic resume analysis endpoint"""
-    if not file.filename.endswith('.pdf'):
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid file format. Only PDF files are allowed."
-        )
+    content = await read_upload(file)
     
     try:
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        return json_response(await job_queue.run("upload", content, backend=backend))
 
-        try:
-            result = analyze_resume(temp_file_path)
-            return result
-        finally:
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+    except QueueFullError:
+        raise
+    except DocumentTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except DocumentError as e:
+        # Content that passed the format sniff but cannot be parsed is the client's error
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/match-profiles")
+async def match_job_profiles(file: UploadFile = File(...), top_n: int = Query(5, ge=1, le=50),
+                             backend: Optional[BackendName] = Query(None)):
+    """Score the resume against every job profile and return the best fits"""
+    content = await read_upload(file)
+    
+    try:
+        return json_response(await job_queue.run("match-profiles", content, top_n=top_n, backend=backend))
 
+    except QueueFullError:
+        raise
+    except DocumentTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except DocumentError as e:
+        # Content that passed the format sniff but cannot be parsed is the client's error
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/analyze-resume")
-async def detailed_resume_analysis(file: UploadFile = File(...)):
+async def detailed_resume_analysis(file: UploadFile = File(...), backend: Optional[BackendName] = Query(None)):
     """
     Detailed resume analysis with comprehensive scoring
     Returns:
@@ -42,49 +62,55 @@ async def detailed_resume_analysis(file: UploadFile = File(...)):
     - Keywords relevance score
     - Page length optimization score
     """
-    if not file.filename.endswith('.pdf'):
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid file format. Only PDF files are allowed."
-        )
+    content = await read_upload(file)
     
     try:
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-
-        try:
-            basic_analysis = analyze_resume(temp_file_path)
-            detailed_scores = get_detailed_scores(temp_file_path, basic_analysis)
-            response_data =  {
-                "detailed_scores": {
-                    "total_final_score": detailed_scores["total_final_score"],
-                    "grammar_final_score": detailed_scores["grammar_final_score"],
-                    "action_final_score": detailed_scores["action_final_score"],
-                    "ats_final_score": detailed_scores["ats_final_score"],
-                    "keywords_final_score": detailed_scores["keywords_final_score"],
-                    "page_length_final_score": detailed_scores["page_length_final_score"]
-                },
-                "analysis_details": basic_analysis,
-                "improvement_suggestions": detailed_scores["suggestions"]
-            }
-            print(f"response send: {response_data}")
-            return {
-                "detailed_scores": {
-                    "total_final_score": detailed_scores["total_final_score"],
-                    "grammar_final_score": detailed_scores["grammar_final_score"],
-                    "action_final_score": detailed_scores["action_final_score"],
-                    "ats_final_score": detailed_scores["ats_final_score"],
-                    "keywords_final_score": detailed_scores["keywords_final_score"],
-                    "page_length_final_score": detailed_scores["page_length_final_score"]
-                },
-                "analysis_details": basic_analysis,
-                "improvement_suggestions": detailed_scores["suggestions"]
-            }
-        finally:
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+        return json_response(await job_queue.run("analyze-resume", content, backend=backend))
 
+    except QueueFullError:
+        raise
+    except DocumentTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except DocumentError as e:
+        # Content that passed the format sniff but cannot be parsed is the client's error
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def _stream_events(content: bytes, backend: Optional[str]):
+    try:
+        async for event, data in progressive_analysis(content, backend):
+            yield _sse(event, data)
+    except DocumentTooLargeError as e:
+        yield _sse("error", {"status_code": 413, "detail": str(e)})
+    except DocumentError as e:
+        yield _sse("error", {"status_code": 400, "detail": str(e)})
+    except Exception as e:
+        yield _sse("error", {"status_code": 500, "detail": getattr(e, "detail", None) or str(e)})
+    finally:
+        analysis_executor.release()
+
+@router.post("/analyze-resume/stream")
+async def stream_resume_analysis(file: UploadFile = File(...), backend: Optional[BackendName] = Query(None)):
+    """
+    Detailed resume analysis as Server-Sent Events
+    Each sub-score is sent as soon as it is computed, grammar last,
+    followed by a "complete" event with the full /analyze-resume response.
+    """
+    content = await read_upload(file)
+
+    # Admission is decided before streaming starts so a full queue is still a 503
+    analysis_executor.acquire()
+    return StreamingResponse(
+        _stream_events(content, backend),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/cache-stats")
+async def cache_stats():
+    """Hit, miss and eviction counters of the result cache"""
+    return result_cache.snapshot()
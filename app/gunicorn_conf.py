@@ -0,0 +1,48 @@
+"""Gunicorn settings for running several uvicorn workers that share loaded models.
+
+    gunicorn -c app/gunicorn_conf.py app.main:app
+
+With preload_app the app is imported once in the master, which then loads
+the components listed in RESUME_PRELOAD before forking. Workers share those
+pages copy-on-write, and LanguageTool servers started in the master are
+reached by every worker over localhost, so memory no longer grows with one
+spaCy pipeline and one JVM per worker.
+"""
+import gc
+import os
+import tempfile
+
+bind = os.getenv("BIND", "0.0.0.0:80")
+workers = int(os.getenv("WEB_CONCURRENCY", 4))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# Job polls and preview page requests land on any worker, so with several workers
+# job records and preview documents go to files they all share, unless the settings
+# already name them. Set before the app (and app.config) is imported by preload_app.
+if workers > 1:
+    os.environ.setdefault("RESUME_JOB_STORE_PATH", os.path.join(tempfile.gettempdir(), "resume-jobs.sqlite3"))
+    os.environ.setdefault("PREVIEW_DOCUMENT_DIR", os.path.join(tempfile.gettempdir(), "resume-preview-documents"))
+
+
+def when_ready(server):
+    """Load shared components in the master just before the workers are forked"""
+    # Imported here because gunicorn treats module-level names as settings
+    from app.config import PRELOAD_COMPONENTS
+    from app.services.registry import model_registry
+    model_registry.warm_up(PRELOAD_COMPONENTS)
+    # Keep the collector out of everything loaded so far; otherwise each
+    # worker's GC passes write to the shared pages and undo copy-on-write
+    gc.freeze()
+
+
+def child_exit(server, worker):
+    """Drop the live metrics of a worker that exited"""
+    from app.services.metrics import mark_process_dead
+    mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    """Stop the LanguageTool servers the master started"""
+    from app.services.grammar import grammar_pool
+    grammar_pool.close()
@@ -1,17 +1,27 @@
-from fastapi import FastAPI, UploadFile, File
+import time
+
+# Taken before the imports below (FastAPI, numpy, PyMuPDF, LanguageTool, the keyword
+# automaton, every router), which are most of the cost of booting a worker
+BOOT_STARTED = time.perf_counter()
+
+import asyncio
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from app import config
+from app.endpoints.batch import router as batch_router
+from app.endpoints.jobs import router as jobs_router
+from app.endpoints.preview import router as preview_router
 from app.endpoints.upload import router as upload_router
-<<<<<<< HEAD
-from flask import Flask
-from flask_cors import CORS
-=======
-from pdf2image import convert_from_bytes
-import base64
-from io import BytesIO
+from app.middleware import BodySizeLimitMiddleware, RequestMetricsMiddleware
+from app.services.executor import QueueFullError, analysis_executor
+from app.services.grammar import grammar_pool
+from app.services.jobs import job_queue
+from app.services.metrics import render as render_metrics
+from app.services.ocr import ocr_engine
+from app.services.registry import model_registry
 
-
->>>>>>> 38b0cc63ae5fb89036b2240fb1e5e5b8811748a9
+startup_seconds = None
 
 app = FastAPI(
     title="Resume AI Analyzer",
@@ -28,8 +38,46 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Refuse oversized request bodies before they are read into memory
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=config.MAX_REQUEST_BYTES,
+    path_limits={"/api/v1/analyze-batch": config.BATCH_MAX_REQUEST_BYTES}
+)
+
+# Outermost, so requests refused by the other middleware are counted too
+app.add_middleware(RequestMetricsMiddleware)
+
 # Include routers
 app.include_router(upload_router, prefix="/api/v1", tags=["Resume Analysis"])
+app.include_router(batch_router, prefix="/api/v1", tags=["Resume Analysis"])
+app.include_router(jobs_router, prefix="/api/v1", tags=["Jobs"])
+app.include_router(preview_router, tags=["Preview"])
+
+@app.exception_handler(QueueFullError)
+async def queue_full_handler(request: Request, exc: QueueFullError):
+    """Tell clients to back off while the analysis queue is saturated"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+@app.on_event("startup")
+async def warm_up_models():
+    """Load the components listed in RESUME_WARM_UP before serving requests"""
+    global startup_seconds
+    await asyncio.get_running_loop().run_in_executor(
+        None, model_registry.warm_up, config.WARM_UP_COMPONENTS
+    )
+    startup_seconds = round(time.perf_counter() - BOOT_STARTED, 3)
+
+@app.on_event("shutdown")
+async def shutdown_executor():
+    """Stop the analysis and OCR worker pools and LanguageTool servers"""
+    analysis_executor.shutdown()
+    ocr_engine.shutdown()
+    grammar_pool.close()
 
 @app.get("/", tags=["Health"])
 async def root():
@@ -45,30 +93,22 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "message": "Service is running normally"
+        "message": "Service is running normally",
+        "grammar_pool": grammar_pool.snapshot(),
+        "jobs": await job_queue.snapshot(),
+        "ocr": ocr_engine.snapshot()
     }
-<<<<<<< HEAD
-=======
 
-@app.post("/preview/")
-async def generate_preview(file: UploadFile = File(...)):
-    # Read the PDF file into memory
-    pdf_data = await file.read()
-    
-    # Convert the PDF pages to images
-    images = convert_from_bytes(pdf_data)
-    
-    # Encode the images as base64 strings with numbered labels
-    preview_images = []
-    for i, img in enumerate(images):
-        buffer = BytesIO()
-        img.save(buffer, format="JPEG")
-        img_base64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
-        preview_images.append({
-            "page": i + 1,
-            "image": f"data:image/jpeg;base64,{img_base64}"
-        })
-    
-    # Return the numbered images
-    return JSONResponse(content={"preview_images": preview_images})
->>>>>>> 38b0cc63ae5fb89036b2240fb1e5e5b8811748a9
+@app.get("/metrics", tags=["Health"])
+async def metrics():
+    """Per-stage latency histograms, error and cache counters and queue gauges in Prometheus format"""
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
+
+@app.get("/diagnostics", tags=["Health"])
+async def diagnostics():
+    """Startup time and per-component load time and memory"""
+    return {
+        "startup_seconds": startup_seconds,
+        "components": model_registry.diagnostics()
+    }
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from app import config
+from app.services.metrics import CACHE_LOOKUPS
+from app.services.storage import ProcessConnection
+
+
+class ResultCache:
+    """Content-addressed cache for analysis results.
+
+    Results are kept in an in-process LRU tier bounded by entry count and TTL,
+    and optionally mirrored to a SQLite file so they survive restarts and are
+    shared between worker processes.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.db_path = db_path
+        # With a SQLite tier, get and set wait on disk and belong off the event loop
+        self.blocking = bool(db_path)
+        self._db = ProcessConnection(
+            db_path,
+            "CREATE TABLE IF NOT EXISTS results "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+        ) if db_path else None
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        return self._db.get() if self._db is not None else None
+
+    @staticmethod
+    def key(content: bytes, namespace: str, version: str) -> str:
+        """Build a cache key from the document bytes and analyzer version"""
+        digest = hashlib.sha256(content).hexdigest()
+        return f"{namespace}:{version}:{digest}"
+
+    def get(self, key: str, count_miss: bool = True) -> Optional[Any]:
+        """Return a cached result, or None on a miss.
+
+        Callers that check ahead of a later get() pass count_miss=False so a
+        miss is counted only once.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created, value = entry
+                if now - created < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    CACHE_LOOKUPS.labels("hit").inc()
+                    return value
+                del self._entries[key]
+
+            db = self._connection()
+            if db is not None:
+                row = db.execute(
+                    "SELECT value, created FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] < self.ttl_seconds:
+                    value = json.loads(row[0])
+                    self._store(key, value, row[1])
+                    self.stats['hits'] += 1
+                    self.stats['disk_hits'] += 1
+                    CACHE_LOOKUPS.labels("disk_hit").inc()
+                    return value
+
+            if count_miss:
+                self.stats['misses'] += 1
+                CACHE_LOOKUPS.labels("miss").inc()
+            return None
+
+    def set(self, key: str, value: Any):
+        """Cache a JSON-serializable result"""
+        created = time.time()
+        with self._lock:
+            self._store(key, value, created)
+            db = self._connection()
+            if db is not None:
+                db.execute(
+                    "INSERT OR REPLACE INTO results (key, value, created) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), created)
+                )
+                db.execute(
+                    "DELETE FROM results WHERE created < ?", (created - self.ttl_seconds,)
+                )
+                db.commit()
+
+    def _store(self, key: str, value: Any, created: float):
+        self._entries[key] = (created, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def snapshot(self) -> Dict:
+        """Counters and current size of the cache"""
+        with self._lock:
+            return {**self.stats, 'size': len(self._entries), 'max_entries': self.max_entries}
+
+
+result_cache = ResultCache(
+    max_entries=config.CACHE_MAX_ENTRIES,
+    ttl_seconds=config.CACHE_TTL_SECONDS,
+    db_path=config.CACHE_DB_PATH or None
+)
@@ -0,0 +1,372 @@
+import math
+import os
+import tempfile
+import zipfile
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+from app import config
+from app.services.extraction import BACKENDS, ExtractionBackend, PdfData, backend_chain, is_usable
+from app.services.metrics import EXTRACTION_FALLBACKS, timed
+from app.services.sections import SectionSpan, find_sections
+
+# A document given as a file path, raw bytes or an open binary stream
+DocumentSource = Union[str, bytes, bytearray, memoryview, BinaryIO]
+
+# Accepted document formats, told apart by their content rather than their file name
+FORMATS = ("pdf", "docx")
+PDF_MAGIC = b"%PDF-"
+# The PDF header may follow a little leading junk, which readers tolerate
+MAGIC_SEARCH_BYTES = 1024
+# DOCX files are zip packages whose main part is word/document.xml
+ZIP_MAGIC = b"PK\x03\x04"
+DOCX_MAIN_PART = "word/document.xml"
+
+# DOCX has no page layout until Word renders it, so pages are estimated from the
+# amount of text: average glyph width and line height relative to the font size,
+# and US Letter with 1 inch margins where a section leaves the page setup out
+DOCX_CHAR_WIDTH_EM = 0.5
+DOCX_LINE_HEIGHT_EM = 1.2
+DOCX_DEFAULT_FONT_POINTS = 11.0
+DOCX_DEFAULT_PAGE = (612.0, 792.0, 72.0)
+
+
+class DocumentError(Exception):
+    """Raised when a document cannot be parsed.
+
+    A plain exception rather than HTTPException so it survives being
+    pickled back from a worker process.
+    """
+
+
+class DocumentTooLargeError(DocumentError):
+    """Raised when a document has more pages than RESUME_MAX_PAGES"""
+
+
+@dataclass
+class ParsedDocument:
+    """Resume content parsed once per request and shared by every analyzer"""
+    text: str
+    pages: List[str]
+    page_count: int
+    metadata: Dict = field(default_factory=dict)
+    _sections: Optional[List[SectionSpan]] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def sections(self) -> List[SectionSpan]:
+        """Headed sections of the text, detected on first use"""
+        if self._sections is None:
+            self._sections = find_sections(self.text)
+        return self._sections
+
+    def section_text(self, *names: str) -> Optional[str]:
+        """Text of the named sections in document order, or None when none of them has a heading"""
+        parts = [self.text[span.start:span.end] for span in self.sections if span.name in names]
+        return "\n".join(parts) if parts else None
+
+
+def is_pdf(head: bytes) -> bool:
+    """Whether the first bytes of a file look like a PDF"""
+    return PDF_MAGIC in head[:MAGIC_SEARCH_BYTES]
+
+
+def _has_docx_part(package: Union[str, BinaryIO]) -> bool:
+    try:
+        with zipfile.ZipFile(package) as zipped:
+            if DOCX_MAIN_PART not in zipped.namelist():
+                return False
+            # Sizes come from the central directory, so nothing is inflated to check them
+            unpacked = sum(info.file_size for info in zipped.infolist())
+    except zipfile.BadZipFile:
+        return False
+    if unpacked > config.MAX_DOCX_UNPACKED_BYTES:
+        raise DocumentTooLargeError(
+            f"Word document too large. It unpacks to more than "
+            f"{config.MAX_DOCX_UNPACKED_BYTES / (1024 * 1024):.1f} MB."
+        )
+    return True
+
+
+def is_docx(content: bytes) -> bool:
+    """Whether a whole file is a zip package with a Word document part.
+
+    Raises DocumentTooLargeError for packages that unpack to more than
+    RESUME_MAX_DOCX_UNPACKED_BYTES.
+    """
+    return content.startswith(ZIP_MAGIC) and _has_docx_part(BytesIO(content))
+
+
+def detect_format(content: bytes) -> Optional[str]:
+    """"pdf" or "docx" from the content of a file, or None for anything else"""
+    if is_pdf(content):
+        return "pdf"
+    if is_docx(content):
+        return "docx"
+    return None
+
+
+def detect_file_format(path: str) -> Optional[str]:
+    """"pdf" or "docx" for a file on disk from its head, opening the zip directory only for zip files.
+
+    Raises DocumentTooLargeError like is_docx.
+    """
+    try:
+        with open(path, "rb") as file:
+            head = file.read(MAGIC_SEARCH_BYTES)
+        if is_pdf(head):
+            return "pdf"
+        if head.startswith(ZIP_MAGIC) and _has_docx_part(path):
+            return "docx"
+    except OSError:
+        pass
+    return None
+
+
+def read_source(source: DocumentSource) -> PdfData:
+    """A path as is, anything else as bytes, so every backend can open it again"""
+    if isinstance(source, str):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    return source.read()
+
+
+@dataclass
+class PageRange:
+    """Text and layout of consecutive pages, extracted by one worker"""
+    start: int
+    pages: List[str]
+    layout: List[Dict]
+
+
+def check_page_limit(page_count: int, max_pages: Optional[int] = None):
+    """Refuse documents above RESUME_MAX_PAGES unless only a bounded number of pages is extracted"""
+    if page_count > config.MAX_PAGES and (max_pages is None or max_pages > config.MAX_PAGES):
+        raise DocumentTooLargeError(
+            f"Document has {page_count} pages. The maximum is {config.MAX_PAGES}."
+        )
+
+
+def _assemble(pages: List[str], layout: List[Dict], page_count: int, extractor: str, info: Dict) -> ParsedDocument:
+    return ParsedDocument(
+        text="".join(page + "\n" for page in pages),
+        pages=pages,
+        page_count=page_count,
+        metadata={
+            'format': 'pdf',
+            'extractor': extractor,
+            'extracted_pages': len(pages),
+            'layout': layout,
+            'producer': info['producer'],
+            'creator': info['creator'],
+        }
+    )
+
+
+def _extract(backend: ExtractionBackend, data: PdfData, max_pages: Optional[int]) -> ParsedDocument:
+    doc = backend.open(data)
+    try:
+        page_count = backend.page_count(doc)
+        # Checked before any text is extracted so huge documents are refused cheaply
+        check_page_limit(page_count, max_pages)
+        # Pages past the cap are never touched
+        stop = page_count if max_pages is None else min(page_count, max_pages)
+        pages = [backend.page_text(doc, index) for index in range(stop)]
+        layout = [backend.page_layout(doc, index) for index in range(stop)]
+        info = backend.info(doc)
+    finally:
+        backend.close(doc)
+    return _assemble(pages, layout, page_count, backend.name, info)
+
+
+@timed("extraction")
+def parse_document(source: DocumentSource, backend: Optional[str] = None,
+                   max_pages: Optional[int] = None) -> ParsedDocument:
+    """Parse a PDF from a path, bytes or stream into a ParsedDocument.
+
+    The requested backend (or RESUME_EXTRACTION_BACKEND) is tried first; the
+    configured fallbacks are tried in turn when it fails or its text is
+    empty or garbled. With max_pages only the first pages are extracted,
+    while page_count still counts every page.
+    """
+    data = read_source(source)
+    best = None
+    error = None
+    for extractor in backend_chain(backend):
+        try:
+            document = _extract(extractor, data, max_pages)
+        except DocumentError:
+            raise
+        except Exception as e:
+            EXTRACTION_FALLBACKS.labels(extractor.name, "error").inc()
+            error = e
+            continue
+        if is_usable(document.text):
+            return document
+        EXTRACTION_FALLBACKS.labels(extractor.name, "garbled" if document.text.strip() else "empty").inc()
+        if best is None or (document.text.strip() and not best.text.strip()):
+            best = document
+
+    # Nothing better was found, e.g. a scanned resume without a text layer
+    if best is not None:
+        return best
+    raise DocumentError(f"Error extracting text: {str(error)}")
+
+
+@timed("extraction_range")
+def extract_page_range(source: DocumentSource, backend: str, start: int, stop: int) -> PageRange:
+    """Extract pages [start, stop) with one backend and no fallback, for parallel extraction"""
+    extractor = BACKENDS[backend]
+    try:
+        doc = extractor.open(read_source(source))
+        try:
+            pages = [extractor.page_text(doc, index) for index in range(start, stop)]
+            layout = [extractor.page_layout(doc, index) for index in range(start, stop)]
+        finally:
+            extractor.close(doc)
+    except Exception as e:
+        raise DocumentError(f"Error extracting text: {str(e)}")
+    return PageRange(start=start, pages=pages, layout=layout)
+
+
+def merge_page_ranges(head: ParsedDocument, ranges: List[PageRange]) -> ParsedDocument:
+    """Append page ranges extracted in parallel to the first pages, in page order"""
+    pages = list(head.pages)
+    layout = list(head.metadata['layout'])
+    for page_range in sorted(ranges, key=lambda page_range: page_range.start):
+        pages.extend(page_range.pages)
+        layout.extend(page_range.layout)
+    return _assemble(pages, layout, head.page_count, head.metadata['extractor'], head.metadata)
+
+
+def replace_pages(document: ParsedDocument, pages: List[str]) -> ParsedDocument:
+    """The same document with new page texts, e.g. pages read by OCR"""
+    metadata = document.metadata
+    return _assemble(pages, metadata['layout'], document.page_count, metadata['extractor'], metadata)
+
+
+def _docx_blocks(doc) -> Iterator[Tuple[str, str, Optional[float], bool]]:
+    """Text, style name, font size and a preceding page break of each paragraph and table row, in body order"""
+    from docx.table import Table
+    from docx.oxml.ns import qn
+    for block in doc.iter_inner_content():
+        if isinstance(block, Table):
+            for row in block.rows:
+                cells = []
+                for cell in row.cells:
+                    # Merged cells are returned once for every grid column they span
+                    if not cells or cell.text != cells[-1]:
+                        cells.append(cell.text)
+                yield "\t".join(cells), "Table", None, False
+            continue
+        size = next((run.font.size.pt for run in block.runs if run.font.size), None)
+        if size is None and block.style is not None and block.style.font.size:
+            size = block.style.font.size.pt
+        page_break = bool(block.paragraph_format.page_break_before) or any(
+            br.get(qn("w:type")) == "page" for br in block._p.iter(qn("w:br"))
+        )
+        yield block.text, block.style.name if block.style is not None else "Normal", size, page_break
+
+
+def _docx_page(doc) -> Tuple[float, float, float, float]:
+    """Page width and height and usable text width and height, in points"""
+    width, height, margin = DOCX_DEFAULT_PAGE
+    section = doc.sections[0] if len(doc.sections) else None
+
+    def points(length, default: float) -> float:
+        return length.pt if length is not None else default
+
+    if section is None:
+        return width, height, width - 2 * margin, height - 2 * margin
+    width = points(section.page_width, width)
+    height = points(section.page_height, height)
+    text_width = width - points(section.left_margin, margin) - points(section.right_margin, margin)
+    text_height = height - points(section.top_margin, margin) - points(section.bottom_margin, margin)
+    return width, height, max(text_width, 72.0), max(text_height, 72.0)
+
+
+@timed("extraction")
+def parse_docx(source: DocumentSource, max_pages: Optional[int] = None) -> ParsedDocument:
+    """Parse a Word document into a ParsedDocument with estimated pages.
+
+    Paragraphs and table rows are read in body order. Pages are estimated
+    from line lengths and font sizes, and hard page breaks start a new
+    page. Nothing is rendered.
+    """
+    import docx
+    data = read_source(source)
+    try:
+        doc = docx.Document(data if isinstance(data, str) else BytesIO(data))
+        width, height, text_width, text_height = _docx_page(doc)
+        normal = doc.styles["Normal"].font if "Normal" in doc.styles else None
+        default_size = normal.size.pt if normal is not None and normal.size else DOCX_DEFAULT_FONT_POINTS
+
+        pages: List[List[str]] = [[]]
+        used = 0.0
+        styles: Counter = Counter()
+        paragraphs = 0
+        for text, style, size, page_break in _docx_blocks(doc):
+            size = size or default_size
+            per_line = max(1, int(text_width / (size * DOCX_CHAR_WIDTH_EM)))
+            block_height = max(1, math.ceil(len(text) / per_line)) * size * DOCX_LINE_HEIGHT_EM
+            if pages[-1] and (page_break or used + block_height > text_height):
+                pages.append([])
+                used = 0.0
+            pages[-1].append(text)
+            used += block_height
+            styles[style] += 1
+            paragraphs += bool(text.strip())
+
+        fonts = {run.font.name for paragraph in doc.paragraphs for run in paragraph.runs if run.font.name}
+        if normal is not None and normal.name:
+            fonts.add(normal.name)
+        metadata = {
+            'paragraphs': paragraphs,
+            'tables': len(doc.tables),
+            'images': len(doc.inline_shapes),
+            'styles': dict(styles),
+            'headings': sum(count for style, count in styles.items() if style.startswith(("Heading", "Title"))),
+            'fonts': sorted(fonts),
+            'default_font_size': default_size,
+            'page_count_estimated': True,
+        }
+        author = doc.core_properties.author or None
+    except Exception as e:
+        raise DocumentError(f"Error extracting text: {str(e)}")
+
+    page_texts = ["\n".join(page) for page in pages]
+    check_page_limit(len(page_texts), max_pages)
+    kept = page_texts if max_pages is None else page_texts[:max_pages]
+    document = _assemble(
+        kept,
+        [{'width': width, 'height': height, 'rotation': 0}] * len(kept),
+        len(page_texts),
+        "python-docx",
+        {'producer': None, 'creator': author}
+    )
+    document.metadata.update(metadata, format='docx')
+    return document
+
+
+@contextmanager
+def document_source(content: bytes) -> Iterator[DocumentSource]:
+    """Yield uploaded content for parsing.
+
+    Small uploads stay in memory. Uploads above SPILL_TO_DISK_BYTES are written
+    to a temporary file so worker processes get a path instead of a large
+    pickled buffer.
+    """
+    if len(content) <= config.SPILL_TO_DISK_BYTES:
+        yield content
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
+        temp_file.write(content)
+        temp_file_path = temp_file.name
+    try:
+        yield temp_file_path
+    finally:
+        if os.path.exists(temp_file_path):
+            os.unlink(temp_file_path)
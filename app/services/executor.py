@@ -0,0 +1,166 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import partial
+from typing import Awaitable, Callable, Iterator, Optional, Tuple
+from app import config
+from app.services.metrics import QUEUE_DEPTH
+
+# Pool workers are started by a single-threaded fork server rather than forked from this
+# process, where a thread may hold a lock at that moment (prometheus_client's multiprocess
+# values share one lock) and leave the child deadlocked; spawn where forkserver is missing
+if "forkserver" in multiprocessing.get_all_start_methods():
+    _WORKER_CONTEXT = multiprocessing.get_context("forkserver")
+    # Imported once in the fork server instead of in every worker
+    _WORKER_CONTEXT.set_forkserver_preload(["app.services.resume_service"])
+else:
+    _WORKER_CONTEXT = multiprocessing.get_context("spawn")
+
+# Slots held by the running request, as (owning task, release, reacquire); a stage with
+# an admission of its own (OCR) gives them back while it waits, see lend_slots()
+_held_slots: ContextVar[Tuple[Tuple[asyncio.Task, Callable[[], None], Callable[[], Awaitable]], ...]] = (
+    ContextVar("held_slots", default=())
+)
+
+
+@contextmanager
+def holding(release: Callable[[], None], reacquire: Callable[[], Awaitable]) -> Iterator[None]:
+    """Record a slot the current task holds, so lend_slots() can give it back"""
+    token = _held_slots.set(_held_slots.get() + ((asyncio.current_task(), release, reacquire),))
+    try:
+        yield
+    finally:
+        _held_slots.reset(token)
+
+
+@asynccontextmanager
+async def lend_slots():
+    """Give back the slots the current task holds for the duration of the block.
+
+    Slots recorded by a parent task are left alone; tasks started inside a
+    request inherit its context but not its slots.
+    """
+    task = asyncio.current_task()
+    held = [(release, reacquire) for owner, release, reacquire in _held_slots.get() if owner is task]
+    for release, _ in reversed(held):
+        release()
+    try:
+        yield
+    finally:
+        for _, reacquire in held:
+            # Shielded, so a cancelled request still ends up holding what it will release
+            await asyncio.shield(reacquire())
+
+
+class QueueFullError(Exception):
+    """Raised when the analysis queue cannot accept more requests"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Analysis queue is full, retry later")
+        self.retry_after = retry_after
+
+
+class AnalysisExecutor:
+    """Runs blocking analysis work in worker pools with a bounded queue depth"""
+
+    def __init__(self, thread_workers: int, process_workers: int,
+                 max_queue_depth: int, retry_after: int):
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.max_queue_depth = max_queue_depth
+        self.retry_after = retry_after
+        self.pending = 0
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+
+    def _thread_pool(self) -> Executor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(
+                max_workers=self.thread_workers,
+                thread_name_prefix="resume-io"
+            )
+        return self._threads
+
+    def _process_pool(self) -> Executor:
+        if self.process_workers <= 0:
+            return self._thread_pool()
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(max_workers=self.process_workers, mp_context=_WORKER_CONTEXT)
+        return self._processes
+
+    def acquire(self):
+        """Reserve a queue slot, raising QueueFullError when the queue is full"""
+        if self.pending >= self.max_queue_depth:
+            raise QueueFullError(self.retry_after)
+        self.pending += 1
+        QUEUE_DEPTH.set(self.pending)
+
+    def release(self):
+        """Give back a slot reserved with acquire()"""
+        self.pending -= 1
+        QUEUE_DEPTH.set(self.pending)
+
+    async def readmit(self):
+        """Take back a slot lent by an admitted request, even when the queue has filled since"""
+        self.pending += 1
+        QUEUE_DEPTH.set(self.pending)
+
+    def held(self):
+        """Record the current request's slot as lendable, see lend_slots()"""
+        return holding(self.release, self.readmit)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Reserve a queue slot for one request, rejecting it when the queue is full"""
+        self.acquire()
+        try:
+            with self.held():
+                yield
+        finally:
+            self.release()
+
+    async def run_io(self, func: Callable, *args):
+        """Run I/O-bound work (LanguageTool calls) on the thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._thread_pool(), partial(func, *args))
+
+    async def run_cpu(self, func: Callable, *args):
+        """Run CPU-bound work (PDF parsing, matching) on the process pool.
+
+        A worker that dies (a crash on a crafted PDF, an OOM kill) breaks the
+        whole pool; the pool is then replaced so only the requests already
+        running on it fail.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._process_pool()
+        try:
+            return await loop.run_in_executor(pool, partial(func, *args))
+        except BrokenProcessPool:
+            self._replace_process_pool(pool)
+            raise
+
+    def _replace_process_pool(self, broken: Executor):
+        # Several requests see the same broken pool; only the first replaces it
+        if self._processes is broken:
+            self._processes = None
+            broken.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """Stop the worker pools"""
+        if self._threads is not None:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+            self._threads = None
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+            self._processes = None
+
+
+analysis_executor = AnalysisExecutor(
+    thread_workers=config.THREAD_WORKERS,
+    process_workers=config.PROCESS_WORKERS,
+    max_queue_depth=config.MAX_QUEUE_DEPTH,
+    retry_after=config.RETRY_AFTER_SECONDS
+)
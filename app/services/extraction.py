@@ -0,0 +1,165 @@
+import re
+from io import BytesIO
+from typing import Any, Dict, List, Literal, Optional, Union
+from app import config
+
+# Names accepted by RESUME_EXTRACTION_BACKEND and the `backend` query parameter
+BackendName = Literal["pymupdf", "pdfplumber", "pypdf2"]
+
+# A PDF as a file path or its raw bytes
+PdfData = Union[str, bytes]
+
+# Text is garbled when too few of its characters are letters, or too many are
+# replacement, control or private-use characters or pdfminer "(cid:N)" escapes
+MIN_LETTER_RATIO = 0.4
+MAX_BAD_RATIO = 0.05
+_CID = re.compile(r"\(cid:\d+\)")
+
+
+class ExtractionBackend:
+    """Reads page count, per-page text and layout from a PDF with one library"""
+    name = ""
+
+    def open(self, data: PdfData) -> Any:
+        raise NotImplementedError
+
+    def page_count(self, doc) -> int:
+        raise NotImplementedError
+
+    def page_text(self, doc, index: int) -> str:
+        raise NotImplementedError
+
+    def page_layout(self, doc, index: int) -> Dict:
+        raise NotImplementedError
+
+    def info(self, doc) -> Dict:
+        """Producer and creator from the document information"""
+        raise NotImplementedError
+
+    def close(self, doc):
+        pass
+
+
+class PyMuPDFBackend(ExtractionBackend):
+    """Fast MuPDF text extraction in content-stream order"""
+    name = "pymupdf"
+
+    def open(self, data: PdfData):
+        import pymupdf
+        if isinstance(data, str):
+            return pymupdf.open(data, filetype="pdf")
+        return pymupdf.open(stream=data, filetype="pdf")
+
+    def page_count(self, doc) -> int:
+        return doc.page_count
+
+    def page_text(self, doc, index: int) -> str:
+        return doc[index].get_text()
+
+    def page_layout(self, doc, index: int) -> Dict:
+        page = doc[index]
+        return {'width': float(page.mediabox.width), 'height': float(page.mediabox.height), 'rotation': page.rotation}
+
+    def info(self, doc) -> Dict:
+        metadata = doc.metadata or {}
+        return {'producer': metadata.get('producer') or None, 'creator': metadata.get('creator') or None}
+
+    def close(self, doc):
+        doc.close()
+
+
+class PdfPlumberBackend(ExtractionBackend):
+    """Slower, layout-aware extraction that groups characters into lines by position"""
+    name = "pdfplumber"
+
+    def open(self, data: PdfData):
+        import pdfplumber
+        return pdfplumber.open(data if isinstance(data, str) else BytesIO(data))
+
+    def page_count(self, doc) -> int:
+        return len(doc.pages)
+
+    def page_text(self, doc, index: int) -> str:
+        page = doc.pages[index]
+        try:
+            return page.extract_text() or ""
+        finally:
+            # pdfplumber caches parsed objects per page; drop them once the text is out
+            page.flush_cache()
+
+    def page_layout(self, doc, index: int) -> Dict:
+        page = doc.pages[index]
+        return {'width': float(page.width), 'height': float(page.height), 'rotation': getattr(page, 'rotation', 0)}
+
+    def info(self, doc) -> Dict:
+        metadata = doc.metadata or {}
+        return {'producer': metadata.get('Producer'), 'creator': metadata.get('Creator')}
+
+    def close(self, doc):
+        doc.close()
+
+
+class PyPDF2Backend(ExtractionBackend):
+    """Pure-Python fallback; slow and lossy on multi-column layouts"""
+    name = "pypdf2"
+
+    def open(self, data: PdfData):
+        import PyPDF2
+        return PyPDF2.PdfReader(data if isinstance(data, str) else BytesIO(data))
+
+    def page_count(self, doc) -> int:
+        return len(doc.pages)
+
+    def page_text(self, doc, index: int) -> str:
+        return doc.pages[index].extract_text() or ""
+
+    def page_layout(self, doc, index: int) -> Dict:
+        page = doc.pages[index]
+        box = page.mediabox
+        return {'width': float(box.width), 'height': float(box.height), 'rotation': page.rotation}
+
+    def info(self, doc) -> Dict:
+        info = doc.metadata
+        return {'producer': info.producer if info else None, 'creator': info.creator if info else None}
+
+
+BACKENDS: Dict[str, ExtractionBackend] = {
+    backend.name: backend for backend in (PyMuPDFBackend(), PdfPlumberBackend(), PyPDF2Backend())
+}
+
+
+def backend_name(name: Optional[str] = None) -> str:
+    """The backend used when a request asks for `name`, or the configured default"""
+    name = name or config.EXTRACTION_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown extraction backend {name!r}. Use one of: {', '.join(BACKENDS)}.")
+    return name
+
+
+def backend_chain(name: Optional[str] = None) -> List[ExtractionBackend]:
+    """The requested backend followed by the configured fallbacks"""
+    first = backend_name(name)
+    names = [first] + [fallback for fallback in config.EXTRACTION_FALLBACKS if fallback != first]
+    return [BACKENDS[name] for name in names if name in BACKENDS]
+
+
+def is_garbled(text: str) -> bool:
+    """Whether extracted text looks like broken font encoding rather than words"""
+    characters = "".join(text.split())
+    if not characters:
+        return False
+    cid_escapes = len(_CID.findall(characters))
+    characters = _CID.sub("", characters)
+    if not characters:
+        return True
+    bad = sum(
+        1 for char in characters
+        if char == "\ufffd" or ord(char) < 32 or 0xE000 <= ord(char) <= 0xF8FF
+    ) + cid_escapes
+    letters = sum(1 for char in characters if char.isalpha())
+    return bad / (len(characters) + cid_escapes) > MAX_BAD_RATIO or letters / len(characters) < MIN_LETTER_RATIO
+
+
+def is_usable(text: str) -> bool:
+    """Whether extracted text is worth analyzing, or another backend should be tried"""
+    return bool(text.strip()) and not is_garbled(text)
@@ -0,0 +1,330 @@
+import bisect
+import os
+import queue
+import re
+import threading
+import time
+import language_tool_python
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from app import config
+from app.services.registry import model_registry
+
+
+class GrammarMatch(NamedTuple):
+    """A grammar issue with its offset in the checked text"""
+    offset: int
+    length: int
+    message: str
+    rule_id: str
+    replacements: Tuple[str, ...]
+
+    def __str__(self):
+        return self.message
+
+
+class GrammarUnavailableError(Exception):
+    """Raised when no LanguageTool instance is available in time"""
+
+
+class _PooledTool:
+    """A LanguageTool instance with the time it was last known to work"""
+
+    def __init__(self, tool):
+        self.tool = tool
+        self.checked_at = time.monotonic()
+        # Instances started before a fork are shared with the other workers
+        self.owner_pid = os.getpid()
+
+
+class LanguageToolPool:
+    """Pool of LanguageTool instances shared by concurrent grammar checks.
+
+    Each local instance runs its own JVM server, so checks scale with the pool
+    size instead of queuing behind one server. Instances are started on first
+    use, pinged before reuse when they have been idle longer than the health
+    check interval, and replaced when they fail.
+    """
+
+    def __init__(self, size: int, language: str, remote_server: Optional[str] = None,
+                 checkout_timeout: float = 30, health_check_seconds: float = 60):
+        self.size = size
+        self.language = language
+        self.remote_server = remote_server
+        self.checkout_timeout = checkout_timeout
+        self.health_check_seconds = health_check_seconds
+        self._idle: "queue.LifoQueue[_PooledTool]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self.restarts = 0
+
+    def _start(self) -> _PooledTool:
+        if self.remote_server:
+            tool = language_tool_python.LanguageTool(self.language, remote_server=self.remote_server)
+        else:
+            tool = language_tool_python.LanguageTool(self.language)
+        return _PooledTool(tool)
+
+    def _discard(self, pooled: _PooledTool):
+        if pooled.owner_pid == os.getpid():
+            try:
+                pooled.tool.close()
+            except Exception:
+                pass
+        with self._lock:
+            self._created -= 1
+
+    def _checkout(self) -> _PooledTool:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_start = self._created < self.size
+            if can_start:
+                self._created += 1
+        if can_start:
+            try:
+                return self._start()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.checkout_timeout)
+        except queue.Empty:
+            raise GrammarUnavailableError("No LanguageTool instance available")
+
+    def _healthy(self, pooled: _PooledTool) -> bool:
+        if time.monotonic() - pooled.checked_at < self.health_check_seconds:
+            return True
+        try:
+            pooled.tool.check("Health check.")
+            pooled.checked_at = time.monotonic()
+            return True
+        except Exception:
+            return False
+
+    @contextmanager
+    def instance(self):
+        """Check out a healthy LanguageTool instance, restarting it if it crashes"""
+        pooled = self._checkout()
+        if not self._healthy(pooled):
+            self._restart(pooled)
+            pooled = self._checkout()
+
+        try:
+            yield pooled.tool
+        except Exception:
+            self._restart(pooled)
+            raise
+        else:
+            pooled.checked_at = time.monotonic()
+            self._idle.put(pooled)
+
+    def _restart(self, pooled: _PooledTool):
+        self._discard(pooled)
+        with self._lock:
+            self.restarts += 1
+
+    def check(self, text: str) -> List:
+        """Run a grammar check, retrying once on a fresh instance if the first one fails"""
+        try:
+            with self.instance() as tool:
+                return tool.check(text)
+        except GrammarUnavailableError:
+            raise
+        except Exception:
+            with self.instance() as tool:
+                return tool.check(text)
+
+    def warm_up(self) -> "LanguageToolPool":
+        """Start every instance of the pool in parallel"""
+        with ThreadPoolExecutor(max_workers=max(1, self.size)) as starter:
+            started = list(starter.map(lambda _: self._checkout(), range(self.size)))
+        for pooled in started:
+            self._idle.put(pooled)
+        return self
+
+    def server_url(self) -> str:
+        """Base URL of a LanguageTool server other processes can share, starting one instance if needed"""
+        if self.remote_server:
+            return self.remote_server
+        with self.instance() as tool:
+            # language_tool_python only keeps the address as its private v2 API URL
+            url = tool._url
+        return url[:-len("v2/")] if url.endswith("v2/") else url
+
+    def snapshot(self) -> Dict:
+        """Size and restart counters of the pool"""
+        return {
+            'size': self.size,
+            'started': self._created,
+            'idle': self._idle.qsize(),
+            'restarts': self.restarts,
+            'remote_server': self.remote_server or None
+        }
+
+    def close(self):
+        """Shut down every idle instance"""
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(pooled)
+
+
+grammar_pool = LanguageToolPool(
+    size=config.LANGUAGE_TOOL_POOL_SIZE,
+    language=config.LANGUAGE_TOOL_LANGUAGE,
+    remote_server=config.LANGUAGE_TOOL_SERVER or None,
+    checkout_timeout=config.LANGUAGE_TOOL_CHECKOUT_TIMEOUT,
+    health_check_seconds=config.LANGUAGE_TOOL_HEALTH_CHECK_SECONDS
+)
+
+model_registry.register("language_tool", grammar_pool.warm_up)
+
+
+# Sentence boundaries inside a line
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z])")
+_URL_RE = re.compile(r"(https?://|www\.)\S+|\S+@\S+\.\w+", re.I)
+_PHONE_RE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_LIST_SEPARATOR_RE = re.compile(r"[,|;•·/]")
+_WORD_RE = re.compile(r"[A-Za-z]+")
+
+
+def split_sentences(text: str) -> List[Tuple[int, str]]:
+    """Split text into (offset, sentence) pairs on line and sentence boundaries"""
+    sentences = []
+    for line in re.finditer(r"[^\n]+", text):
+        start = line.start()
+        for part in _SENTENCE_END_RE.split(line.group()):
+            offset = text.index(part, start)
+            start = offset + len(part)
+            if part.strip():
+                sentences.append((offset, part))
+    return sentences
+
+
+def is_checkable(sentence: str) -> bool:
+    """Whether a sentence can produce useful grammar matches.
+
+    Contact lines, URLs and bullet lists of skills only produce spelling
+    noise, and very short fragments have nothing to check.
+    """
+    stripped = _PHONE_RE.sub(" ", _URL_RE.sub(" ", sentence))
+    words = _WORD_RE.findall(stripped)
+    if len(words) < 3:
+        return False
+    # "Python, SQL, Docker, AWS" style lists: every item is a short phrase
+    items = [item for item in _LIST_SEPARATOR_RE.split(stripped) if _WORD_RE.search(item)]
+    return len(items) < 3 or any(len(_WORD_RE.findall(item)) > 3 for item in items)
+
+
+class _SentenceMemo:
+    """LRU memo of grammar matches per sentence, with offsets relative to the sentence"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, List[GrammarMatch]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sentence: str) -> Optional[List[GrammarMatch]]:
+        with self._lock:
+            matches = self._entries.get(sentence)
+            if matches is not None:
+                self._entries.move_to_end(sentence)
+            return matches
+
+    def set(self, sentence: str, matches: List[GrammarMatch]):
+        with self._lock:
+            self._entries[sentence] = matches
+            self._entries.move_to_end(sentence)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_sentence_memo = _SentenceMemo(config.GRAMMAR_MEMO_SIZE)
+_chunk_executor = ThreadPoolExecutor(
+    max_workers=max(1, config.LANGUAGE_TOOL_POOL_SIZE),
+    thread_name_prefix="grammar-chunk"
+)
+
+
+def _to_match(match, offset: int) -> GrammarMatch:
+    return GrammarMatch(
+        offset=match.offset - offset,
+        length=match.errorLength,
+        message=str(match.message),
+        rule_id=getattr(match, 'ruleId', ''),
+        replacements=tuple(getattr(match, 'replacements', ())[:5])
+    )
+
+
+def _check_chunk(sentences: List[str]) -> Dict[str, List[GrammarMatch]]:
+    """Check a group of sentences in one LanguageTool request and split the matches back out"""
+    starts = []
+    position = 0
+    for sentence in sentences:
+        starts.append(position)
+        position += len(sentence) + 2
+    matches = model_registry.get("language_tool").check("\n\n".join(sentences))
+
+    results = {sentence: [] for sentence in sentences}
+    for match in matches:
+        index = max(0, bisect.bisect_right(starts, match.offset) - 1)
+        results[sentences[index]].append(_to_match(match, starts[index]))
+    return results
+
+
+def _chunks(sentences: List[str], max_chars: int) -> List[List[str]]:
+    """Group sentences into requests of about max_chars characters"""
+    chunks, current, size = [], [], 0
+    for sentence in sentences:
+        if current and size + len(sentence) > max_chars:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(sentence)
+        size += len(sentence) + 2
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def check_text(text: str) -> List[GrammarMatch]:
+    """Grammar-check text sentence by sentence.
+
+    Sentences that cannot produce useful matches are skipped, repeated
+    sentences are served from the memo, and the rest are checked
+    concurrently in chunks across the LanguageTool pool. Match offsets
+    refer to the original text.
+    """
+    sentences = [(offset, sentence) for offset, sentence in split_sentences(text) if is_checkable(sentence)]
+
+    found: Dict[str, List[GrammarMatch]] = {}
+    unchecked = []
+    for _, sentence in sentences:
+        if sentence in found:
+            continue
+        memoized = _sentence_memo.get(sentence)
+        if memoized is None:
+            unchecked.append(sentence)
+            found[sentence] = []
+        else:
+            found[sentence] = memoized
+
+    for results in _chunk_executor.map(_check_chunk, _chunks(unchecked, config.GRAMMAR_CHUNK_CHARS)):
+        for sentence, matches in results.items():
+            _sentence_memo.set(sentence, matches)
+            found[sentence] = matches
+
+    return [
+        match._replace(offset=offset + match.offset)
+        for offset, sentence in sentences
+        for match in found[sentence]
+    ]
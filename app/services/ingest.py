@@ -0,0 +1,56 @@
+from typing import Sequence
+from fastapi import HTTPException, UploadFile
+from app import config
+from app.services.document import FORMATS, ZIP_MAGIC, DocumentTooLargeError, detect_format, is_pdf
+from app.services.metrics import stage
+
+
+def too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. The maximum size is {max_bytes / (1024 * 1024):.1f} MB."
+    )
+
+
+def unsupported_format(formats: Sequence[str] = FORMATS) -> HTTPException:
+    return HTTPException(
+        status_code=415,
+        detail=f"Invalid file content. Only {' and '.join(name.upper() for name in formats)} files are allowed."
+    )
+
+
+def _may_be(head: bytes, formats: Sequence[str]) -> bool:
+    """Whether the first chunk of an upload can start one of the formats"""
+    return ("pdf" in formats and is_pdf(head)) or ("docx" in formats and head.startswith(ZIP_MAGIC))
+
+
+async def read_upload(file: UploadFile, max_bytes: int = config.MAX_UPLOAD_BYTES,
+                      formats: Sequence[str] = FORMATS) -> bytes:
+    """Read an upload in chunks, rejecting unsupported content and oversized files early.
+
+    The type comes from the content, never the file name: the first chunk
+    is checked for a PDF header or a zip signature, and a zip is accepted
+    once it is read in full and holds a Word document.
+    """
+    with stage("upload_read"):
+        chunks = []
+        size = 0
+        while True:
+            chunk = await file.read(config.UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            if not chunks and not _may_be(chunk, formats):
+                raise unsupported_format(formats)
+            size += len(chunk)
+            if size > max_bytes:
+                raise too_large(max_bytes)
+            chunks.append(chunk)
+
+        content = b"".join(chunks)
+        try:
+            document_format = detect_format(content)
+        except DocumentTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        if document_format not in formats:
+            raise unsupported_format(formats)
+        return content
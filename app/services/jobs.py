@@ -0,0 +1,336 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+from fastapi import HTTPException
+from app import config
+from app.services.document import DocumentError, DocumentTooLargeError
+from app.services.executor import QueueFullError, analysis_executor, holding
+from app.services.metrics import JOBS_RUNNING
+from app.services.storage import ProcessConnection, call_store
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+# Handlers are awaited as handler(content, admitted=True, **params)
+JobHandler = Callable[..., Awaitable[Any]]
+# Lookups return an already cached result for (content, **params), or None
+JobLookup = Callable[..., Awaitable[Optional[Any]]]
+
+
+class JobNotFoundError(Exception):
+    """Raised for unknown or expired job ids"""
+
+
+class MemoryJobStore:
+    """Job records kept in this process only"""
+    blocking = False
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def put(self, job: Dict):
+        with self._lock:
+            self._jobs[job["job_id"]] = dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def update(self, job_id: str, fields: Dict, statuses: Iterable[str] = ACTIVE_STATUSES) -> bool:
+        """Apply fields to a job whose status is one of statuses"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] not in statuses:
+                return False
+            job.update(fields)
+            return True
+
+    def delete(self, job_id: str):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def purge(self, before: float) -> int:
+        """Drop finished jobs last updated before the given time"""
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job["updated"] < before and job["status"] not in ACTIVE_STATUSES
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+            return len(expired)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+            return counts
+
+
+class SQLiteJobStore:
+    """Job records in a SQLite file, so any worker process can answer a poll"""
+    blocking = True
+
+    COLUMNS = ("job_id", "kind", "status", "created", "updated", "result", "error", "status_code")
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db = ProcessConnection(
+            db_path,
+            "CREATE TABLE IF NOT EXISTS jobs "
+            "(job_id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, "
+            "created REAL NOT NULL, updated REAL NOT NULL, result TEXT, error TEXT, status_code INTEGER)"
+        )
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    def _row(self, job: Dict) -> tuple:
+        return tuple(
+            json.dumps(job.get(column)) if column == "result" else job.get(column)
+            for column in self.COLUMNS
+        )
+
+    def put(self, job: Dict):
+        with self._lock:
+            db = self._connection()
+            db.execute(
+                f"INSERT OR REPLACE INTO jobs ({', '.join(self.COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in self.COLUMNS)})",
+                self._row(job)
+            )
+            db.commit()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._connection().execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(self.COLUMNS, row))
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def update(self, job_id: str, fields: Dict, statuses: Iterable[str] = ACTIVE_STATUSES) -> bool:
+        """Apply fields to a job whose status is one of statuses"""
+        fields = dict(fields)
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"])
+        statuses = list(statuses)
+        with self._lock:
+            db = self._connection()
+            cursor = db.execute(
+                f"UPDATE jobs SET {', '.join(f'{column} = ?' for column in fields)} "
+                f"WHERE job_id = ? AND status IN ({', '.join('?' for _ in statuses)})",
+                (*fields.values(), job_id, *statuses)
+            )
+            db.commit()
+            return cursor.rowcount > 0
+
+    def delete(self, job_id: str):
+        with self._lock:
+            db = self._connection()
+            db.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            db.commit()
+
+    def purge(self, before: float) -> int:
+        """Drop finished jobs last updated before the given time"""
+        with self._lock:
+            db = self._connection()
+            cursor = db.execute(
+                f"DELETE FROM jobs WHERE updated < ? AND status NOT IN ({', '.join('?' * len(ACTIVE_STATUSES))})",
+                (before, *ACTIVE_STATUSES)
+            )
+            db.commit()
+            return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+
+class JobQueue:
+    """Runs analyses as background jobs that clients submit, poll and cancel.
+
+    Results already in the cache are answered without taking a queue slot.
+    Any other submission takes a slot of the analysis queue, so a saturated
+    service still answers 503. At most `concurrency` jobs run at once in this
+    process, and finished jobs are forgotten after `ttl_seconds`.
+    """
+
+    def __init__(self, store, concurrency: int, ttl_seconds: int):
+        self.store = store
+        self.concurrency = concurrency
+        self.ttl_seconds = ttl_seconds
+        self._handlers: Dict[str, tuple] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def register(self, kind: str, handler: JobHandler, lookup: Optional[JobLookup] = None):
+        """Register the coroutine that runs jobs of a kind and an optional cache lookup"""
+        self._handlers[kind] = (handler, lookup)
+
+    @property
+    def kinds(self):
+        return list(self._handlers)
+
+    def _slots(self) -> asyncio.Semaphore:
+        # Created on first use so it belongs to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def _lookup(self, kind: str, content: bytes, params: Dict) -> Optional[Any]:
+        _, lookup = self._handlers[kind]
+        return await lookup(content, **params) if lookup is not None else None
+
+    @staticmethod
+    def _record(job_id: str, kind: str, status: str, now: float, **fields) -> Dict:
+        return {
+            "job_id": job_id, "kind": kind, "status": status, "created": now, "updated": now,
+            "result": None, "error": None, "status_code": None, **fields
+        }
+
+    async def submit(self, kind: str, content: bytes, **params) -> str:
+        """Queue a job and return its id; raises QueueFullError when the service is saturated.
+
+        A cached result is recorded as a finished job at once, without
+        taking a queue slot.
+        """
+        now = time.time()
+        await call_store(self.store.purge, now - self.ttl_seconds)
+        result = await self._lookup(kind, content, params)
+        if result is not None:
+            job_id = uuid.uuid4().hex
+            await call_store(self.store.put, self._record(job_id, kind, DONE, now, result=result, status_code=200))
+            return job_id
+        return await self._start(kind, content, params)
+
+    async def _start(self, kind: str, content: bytes, params: Dict) -> str:
+        handler, _ = self._handlers[kind]
+        analysis_executor.acquire()
+        job_id = uuid.uuid4().hex
+        try:
+            await call_store(self.store.put, self._record(job_id, kind, QUEUED, time.time()))
+        except BaseException:
+            analysis_executor.release()
+            raise
+        task = asyncio.ensure_future(self._execute(job_id, handler, content, params))
+        task.add_done_callback(_retrieve_exception)
+        self._tasks[job_id] = task
+        return job_id
+
+    async def _execute(self, job_id: str, handler: JobHandler, content: bytes, params: Dict):
+        slots = self._slots()
+        try:
+            # Both slots are lent out while the job waits on OCR, which has its own admission
+            with analysis_executor.held():
+                async with slots:
+                    await call_store(
+                        self.store.update, job_id, {"status": RUNNING, "updated": time.time()}, statuses=(QUEUED,)
+                    )
+                    JOBS_RUNNING.inc()
+                    try:
+                        with holding(slots.release, slots.acquire):
+                            result = await handler(content, admitted=True, **params)
+                    finally:
+                        JOBS_RUNNING.dec()
+        except asyncio.CancelledError:
+            await self._finish(job_id, CANCELLED, error="Job was cancelled", status_code=409)
+            raise
+        except Exception as e:
+            await self._finish(
+                job_id, FAILED, error=getattr(e, "detail", None) or str(e), status_code=_status_code(e)
+            )
+            raise
+        else:
+            await self._finish(job_id, DONE, result=result, status_code=200)
+            return result
+        finally:
+            self._tasks.pop(job_id, None)
+            analysis_executor.release()
+
+    async def _finish(self, job_id: str, status: str, **fields):
+        await call_store(self.store.update, job_id, {"status": status, "updated": time.time(), **fields})
+
+    async def get(self, job_id: str) -> Dict:
+        """Current record of a job, including its result once done"""
+        await call_store(self.store.purge, time.time() - self.ttl_seconds)
+        job = await call_store(self.store.get, job_id)
+        if job is None:
+            raise JobNotFoundError(job_id)
+        return job
+
+    async def cancel(self, job_id: str) -> Dict:
+        """Cancel a queued or running job; finished jobs are left as they are"""
+        job = await self.get(job_id)
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+        # Marks jobs running in another worker process; their result is then discarded
+        await self._finish(job_id, CANCELLED, error="Job was cancelled", status_code=409)
+        return await call_store(self.store.get, job_id) or job
+
+    async def run(self, kind: str, content: bytes, **params) -> Any:
+        """Submit a job and wait for it, for the synchronous endpoints.
+
+        Cached results are returned without a job record or a queue slot.
+        Errors are re-raised as they occurred, and the job record is dropped
+        once the result has been handed back.
+        """
+        result = await self._lookup(kind, content, params)
+        if result is not None:
+            return result
+        job_id = await self._start(kind, content, params)
+        try:
+            return await self._tasks[job_id]
+        finally:
+            # A client that disconnects cancels its job
+            task = self._tasks.get(job_id)
+            if task is not None:
+                task.cancel()
+            await call_store(self.store.delete, job_id)
+
+    async def snapshot(self) -> Dict:
+        """Jobs per status and the concurrency limit"""
+        counts = await call_store(self.store.counts)
+        return {"concurrency": self.concurrency, "local_tasks": len(self._tasks), "jobs": counts}
+
+
+def _status_code(error: Exception) -> int:
+    if isinstance(error, HTTPException):
+        return error.status_code
+    if isinstance(error, DocumentTooLargeError):
+        return 413
+    if isinstance(error, DocumentError):
+        return 400
+    if isinstance(error, QueueFullError):
+        return 503
+    return 500
+
+
+def _retrieve_exception(task: asyncio.Task):
+    # Failures are recorded on the job; this keeps asyncio from logging them as unhandled
+    if not task.cancelled():
+        task.exception()
+
+
+job_queue = JobQueue(
+    store=SQLiteJobStore(config.JOB_STORE_PATH) if config.JOB_STORE_PATH else MemoryJobStore(),
+    concurrency=config.JOB_CONCURRENCY,
+    ttl_seconds=config.JOB_TTL_SECONDS
+)
@@ -0,0 +1,735 @@
+import re
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Set
+
+# Keywords expected for each job profile, grouped by category
+KEYWORD_CATEGORIES = {
+    'AI/Machine Learning Engineer': {
+        'technical_skills': [
+            'python', 'tensorflow', 'pytorch', 'r', 'deep learning', 'nlp','ai', 'ml', 'data science', 'neural networks', 'cloud platforms'
+            ],
+        'soft_skills': [
+            'problem solving', 'analytical thinking', 'team collaboration', 'creativity'
+            ],
+        'education': [
+            'master', 'phd', 'computer science', 'mathematics', 'artificial intelligence'
+            ]
+    },
+    'Data Scientist/Analyst': {
+        'technical_skills': [
+            'python', 'r', 'sql', 'tableau', 'power bi', 'data wrangling',
+            'machine learning', 'statistics', 'data visualization'
+        ],
+        'soft_skills': [
+            'data interpretation', 'communication', 'business acumen', 'critical thinking'
+        ],
+        'education': [
+            'master', 'data science', 'statistics', 'analytics', 'mathematics'
+        ]
+    },
+    'Cloud Engineer': {
+        'technical_skills': [
+            'aws', 'azure', 'google cloud', 'terraform', 'docker', 'kubernetes',
+            'devops', 'linux', 'cloud architecture', 'networking'
+        ],
+        'soft_skills': [
+            'adaptability', 'teamwork', 'critical thinking', 'problem solving'
+        ],
+        'education': [
+            'certification', 'aws', 'azure', 'gcp', 'bachelor', 'cloud computing'
+        ]
+    },
+    'Cybersecurity Specialist': {
+        'technical_skills': [
+            'penetration testing', 'firewalls', 'ids/ips', 'ethical hacking',
+            'encryption', 'risk assessment', 'incident response', 'siem tools'
+        ],
+        'soft_skills': [
+            'attention to detail', 'problem solving', 'risk management', 'critical thinking'
+        ],
+        'education': [
+            'bachelor', 'cybersecurity', 'information security', 'certification', 'computer science'
+        ]
+    },
+    'Full-Stack Developer': {
+        'technical_skills': [
+            'javascript', 'node.js', 'react', 'angular', 'html', 'css',
+            'mongodb', 'express.js', 'sql', 'typescript', 'api integration'
+        ],
+        'soft_skills': [
+            'time management', 'collaboration', 'critical thinking', 'problem solving'
+        ],
+        'education': [
+            'bachelor', 'software engineering', 'computer science', 'certification', 'coding bootcamp'
+       ]
+    },
+    'Digital Marketing Specialist': {
+        'technical_skills': [
+            'seo', 'ppc', 'google ads', 'facebook ads', 'email marketing', 'social media marketing',
+            'analytics tools', 'content strategy', 'search engine marketing', 'google analytics'
+        ],
+        'soft_skills': [
+            'creativity', 'problem solving', 'communication', 'time management'
+        ],
+        'education': [
+            'bachelor', 'marketing', 'digital marketing', 'certifications in google ads, facebook marketing'
+        ]
+    },
+    'UX/UI Designer': {
+        'technical_skills': [
+            'figma', 'sketch', 'adobe xd', 'html', 'css', 'user testing',
+            'wireframing', 'prototyping', 'responsive design', 'design systems'
+        ],
+        'soft_skills': [
+            'empathy', 'problem solving', 'creativity', 'collaboration'
+        ],
+        'education': [
+            'bachelor', 'graphic design', 'human-computer interaction', 'certification in ux design'
+        ]
+    },
+    'DevOps Engineer': {
+        'technical_skills': [
+            'docker', 'kubernetes', 'jenkins', 'ci/cd pipelines', 'ansible',
+            'terraform', 'git', 'aws', 'linux', 'cloud computing'
+        ],
+        'soft_skills': [
+            'collaboration', 'problem solving', 'time management', 'critical thinking'
+        ],
+        'education': [
+            'bachelor', 'computer science', 'information technology', 'devops certification'
+        ]
+    },
+    'Product Manager': {
+        'technical_skills': [
+            'product roadmaps', 'agile methodologies', 'scrum', 'user stories', 'ux design',
+            'market research', 'data analysis', 'roadmap planning', 'stakeholder management'
+        ],
+        'soft_skills': [
+            'leadership', 'problem solving', 'decision making', 'communication'
+        ],
+        'education': [
+            'bachelor', 'business administration', 'engineering', 'mba in product management'
+        ]
+    },
+    'Blockchain Developer': {
+        'technical_skills': [
+    'solidity', 'smart contracts', 'ethereum', 'web3', 'cryptography',
+    'blockchain architecture', 'c++', 'python', 'node.js', 'distributed ledger technology'
+],
+'soft_skills': [
+    'problem solving', 'critical thinking', 'attention to detail', 'collaboration'
+],
+'education': [
+    'bachelor', 'computer science', 'cryptography', 'blockchain certification'
+]
+},
+    'Mobile App Developer': {
+        'technical_skills': [
+            'swift', 'kotlin', 'react native', 'flutter', 'android studio',
+            'xcode', 'api integration', 'ui/ux for mobile', 'firebase', 'restful services'
+        ],
+        'soft_skills': [
+            'creativity', 'problem solving', 'time management', 'team collaboration'
+        ],
+        'education': [
+            'bachelor', 'computer science', 'mobile application development', 'certifications in ios/android'
+        ]
+    },
+    'Business Analyst': {
+        'technical_skills': [
+            'sql', 'excel', 'tableau', 'power bi', 'data analysis',
+            'requirements gathering', 'project management tools', 'business process modeling'
+        ],
+        'soft_skills': [
+            'communication', 'analytical thinking', 'problem solving', 'stakeholder management'
+        ],
+        'education': [
+            'bachelor', 'business administration', 'economics', 'mba', 'certifications in business analysis'
+        ]
+    },
+    'IT Support Specialist': {
+        'technical_skills': [
+            'hardware troubleshooting', 'networking', 'windows/osx/linux', 'active directory',
+            'cloud systems', 'help desk software', 'ticketing systems', 'vpn configuration'
+        ],
+        'soft_skills': [
+            'customer service', 'communication', 'problem solving', 'time management'
+        ],
+        'education': [
+            'bachelor', 'information technology', 'computer science', 'certifications like comptia a+ or ccna'
+        ]
+    },
+    'Network Engineer': {
+        'technical_skills': [
+            'network troubleshooting', 'routing and switching', 'tcp/ip', 'vpn', 'firewall configuration',
+            'wi-fi', 'lan/wlan', 'network monitoring', 'ipv4/ipv6', 'network security'
+        ],
+        'soft_skills': [
+            'problem solving', 'attention to detail', 'communication', 'time management'
+        ],
+        'education': [
+            'bachelor', 'computer science', 'network engineering', 'ccna, ccnp certifications'
+        ]
+    },
+    'QA Engineer': {
+        'technical_skills': [
+            'manual testing', 'automated testing', 'selenium', 'pytest', 'test case development',
+            'bug tracking', 'performance testing', 'ci/cd', 'software testing life cycle'
+        ],
+        'soft_skills': [
+            'attention to detail', 'problem solving', 'communication', 'analytical thinking'
+        ],
+        'education': [
+            'bachelor', 'computer science', 'information technology', 'certifications in software testing'
+        ]
+    },
+    'Systems Administrator': {
+        'technical_skills': [
+            'linux', 'windows server', 'active directory', 'virtualization',
+            'network management', 'shell scripting', 'dns', 'backup solutions', 'vmware'
+        ],
+        'soft_skills': [
+            'problem solving', 'attention to detail', 'teamwork', 'time management'
+        ],
+        'education': [
+            'bachelor', 'information technology', 'computer science', 'certifications like mcsa, rhce'
+        ]
+    },
+    'Data Engineer': {
+        'technical_skills': [
+            'python', 'sql', 'hadoop', 'spark', 'etl tools', 'data pipelines',
+            'data modeling', 'aws', 'google cloud', 'databases'
+        ],
+        'soft_skills': [
+            'problem solving', 'analytical thinking', 'communication', 'attention to detail'
+        ],
+        'education': [
+            'bachelor', 'data engineering', 'computer science', 'certifications in big data or cloud'
+        ]
+    },
+    'Graphic Designer': {
+        'technical_skills': [
+            'adobe photoshop', 'adobe illustrator', 'indesign', 'canva', 
+            'graphic design', 'branding', 'typography', 'color theory', 'vector graphics'
+        ],
+        'soft_skills': [
+            'creativity', 'attention to detail', 'communication', 'time management'
+        ],
+        'education': [
+            'bachelor', 'graphic design', 'visual arts', 'certifications in design tools'
+        ]
+    },
+    'Content Writer': {
+        'technical_skills': [
+            'seo', 'copywriting', 'content strategy', 'editing', 'wordpress',
+            'social media management', 'analytics tools', 'storytelling'
+        ],
+        'soft_skills': [
+            'creativity', 'communication', 'time management', 'research skills'
+        ],
+        'education': [
+            'bachelor', 'english literature', 'communications', 'journalism', 'certifications in digital marketing'
+        ]
+    },
+    'Database Administrator': {
+        'technical_skills': [
+            'sql', 'mysql', 'oracle', 'mongodb', 'postgresql', 'database design',
+            'data backup', 'data migration', 'performance tuning', 'cloud databases'
+        ],
+        'soft_skills': [
+            'problem solving', 'analytical thinking', 'attention to detail', 'communication'
+        ],
+        'education': [
+            'bachelor', 'computer science', 'information systems', 'certifications like oracle dba or microsoft sql server'
+        ]
+    },  
+    'SEO Specialist': {
+        'technical_skills': [
+            'google analytics', 'seo audits', 'keyword research', 'content optimization',
+            'backlink analysis', 'technical seo', 'html', 'wordpress', 'rank tracking'
+        ],
+        'soft_skills': [
+            'critical thinking', 'problem solving', 'analytical mindset', 'communication'
+        ],
+        'education': [
+            'bachelor', 'marketing', 'digital marketing', 'certifications in seo or google analytics'
+        ]
+    },
+    'HR Specialist': {
+        'technical_skills': [
+            'payroll systems', 'recruitment tools', 'hr management software', 'performance appraisal systems',
+            'employment laws', 'talent acquisition', 'onboarding processes', 'training and development'
+        ],
+        'soft_skills': [
+            'communication', 'empathy', 'problem solving', 'conflict resolution'
+        ],
+        'education': [
+            'bachelor', 'human resources', 'business administration', 'mba in hr management'
+        ]
+    },
+    'Financial Analyst': {
+        'technical_skills': [
+            'excel', 'financial modeling', 'data analysis', 'sql', 'tableau',
+            'power bi', 'forecasting', 'budgeting', 'sap', 'erp systems'
+        ],
+        'soft_skills': [
+            'analytical thinking', 'problem solving', 'decision making', 'time management'
+        ],
+        'education': [
+            'bachelor', 'finance', 'economics', 'accounting', 'mba', 'cfa certification'
+        ]
+    },
+    'Mechanical Engineer': {
+        'technical_skills': [
+            'autocad', 'solidworks', 'ansys', 'matlab', '3d modeling',
+            'finite element analysis', 'thermodynamics', 'manufacturing processes'
+        ],
+        'soft_skills': [
+            'problem solving', 'analytical thinking', 'teamwork', 'attention to detail'
+        ],
+        'education': [
+            'bachelor', 'mechanical engineering', 'certifications in cad or fea tools'
+        ]
+    },
+    'Civil Engineer': {
+        'technical_skills': [
+            'autocad', 'structural design', 'site development', 'construction management',
+            'project planning', 'civil engineering software', 'cost estimation', 'building codes'
+        ],
+        'soft_skills': [
+            'problem solving', 'communication', 'attention to detail', 'team collaboration'
+        ],
+        'education': [
+            'bachelor', 'civil engineering', 'construction management', 'certifications in project management'
+        ]
+    },
+    'Marketing Manager': {
+        'technical_skills': [
+            'digital marketing', 'seo', 'content marketing', 'market research', 'branding',
+            'email marketing', 'social media strategy', 'analytics tools', 'campaign management'
+        ],
+        'soft_skills': [
+            'leadership', 'strategic thinking', 'communication', 'creativity'
+        ],
+        'education': [
+            'bachelor', 'marketing', 'business administration', 'mba in marketing'
+        ]
+    },
+'Cloud Architect': {
+'technical_skills': [
+    'aws', 'azure', 'google cloud', 'cloud architecture', 'devops', 'kubernetes', 'docker',
+    'terraform', 'cloud migration', 'security in cloud environments'
+],
+'soft_skills': [
+    'leadership', 'problem solving', 'strategic thinking', 'team collaboration'
+],
+'education': [
+    'bachelor', 'computer science', 'information technology', 'certifications in cloud platforms like AWS or Azure'
+]
+},
+'IT Project Manager': {
+'technical_skills': [
+    'project management tools', 'agile methodologies', 'scrum', 'budgeting', 'risk management',
+    'time management', 'team coordination', 'stakeholder management'
+],
+'soft_skills': [
+    'leadership', 'problem solving', 'communication', 'decision making'
+],
+'education': [
+    'bachelor', 'information technology', 'project management', 'pmp certification'
+]
+},
+'Data Scientist': {
+'technical_skills': [
+    'python', 'r', 'machine learning', 'deep learning', 'sql', 'data visualization',
+    'statistics', 'data wrangling', 'big data technologies', 'hadoop', 'spark'
+],
+'soft_skills': [
+    'analytical thinking', 'problem solving', 'communication', 'critical thinking'
+],
+'education': [
+    'bachelor', 'computer science', 'data science', 'statistics', 'masters or phd in data science'
+]
+},
+'Cybersecurity Analyst': {
+'technical_skills': [
+    'network security', 'firewalls', 'encryption', 'incident response', 'penetration testing',
+    'vulnerability assessment', 'siem tools', 'aws security', 'compliance frameworks'
+],
+'soft_skills': [
+    'problem solving', 'attention to detail', 'communication', 'risk management'
+],
+'education': [
+    'bachelor', 'information security', 'cybersecurity', 'certifications like compTIA security+, CEH, CISSP'
+]
+},
+'Marketing Analyst': {
+'technical_skills': [
+    'google analytics', 'seo', 'market research', 'excel', 'power bi', 'customer segmentation',
+    'data analysis', 'digital marketing', 'crm systems'
+],
+'soft_skills': [
+    'analytical thinking', 'communication', 'problem solving', 'attention to detail'
+],
+'education': [
+    'bachelor', 'marketing', 'business administration', 'mba in marketing'
+]
+},
+'Sales Manager': {
+'technical_skills': [
+    'crm systems', 'sales strategies', 'lead generation', 'sales forecasting', 'market research',
+    'email marketing', 'sales analytics', 'negotiation', 'client relationship management'
+],
+'soft_skills': [
+    'leadership', 'communication', 'problem solving', 'team collaboration'
+],
+'education': [
+    'bachelor', 'business administration', 'marketing', 'mba in sales management'
+]
+},
+'Cloud Security Engineer': {
+'technical_skills': [
+    'aws security', 'azure security', 'cloud architecture', 'vpn', 'firewall management', 'encryption',
+    'incident response', 'identity and access management', 'cloud vulnerability assessments'
+],
+'soft_skills': [
+    'problem solving', 'attention to detail', 'communication', 'risk management'
+],
+'education': [
+    'bachelor', 'cybersecurity', 'computer science', 'cloud computing', 'certifications in cloud security'
+]
+},
+'Video Editor': {
+'technical_skills': [
+    'adobe premiere pro', 'final cut pro', 'video editing software', 'motion graphics', 'color grading',
+    'audio editing', 'storyboarding', 'post-production'
+],
+'soft_skills': [
+    'creativity', 'attention to detail', 'time management', 'communication'
+],
+'education': [
+    'bachelor', 'film production', 'media studies', 'certifications in video editing software'
+]
+},
+'Artificial Intelligence Engineer': {
+'technical_skills': [
+    'python', 'tensorflow', 'keras', 'pytorch', 'machine learning', 'deep learning', 'computer vision',
+    'natural language processing', 'reinforcement learning', 'neural networks'
+],
+'soft_skills': [
+    'problem solving', 'analytical thinking', 'communication', 'team collaboration'
+],
+'education': [
+    'bachelor', 'computer science', 'artificial intelligence', 'masters or phd in ai or machine learning'
+]
+},
+'Customer Support Representative': {
+'technical_skills': [
+    'crm software', 'ticketing systems', 'customer service tools', 'helpdesk systems', 'chatbots',
+    'email support', 'phone support', 'issue tracking'
+],
+'soft_skills': [
+    'communication', 'problem solving', 'empathy', 'patience'
+],
+'education': [
+    'high school diploma', 'bachelor', 'customer service certifications'
+]
+},
+'Business Development Manager': {
+'technical_skills': [
+    'market research', 'sales strategies', 'crm systems', 'lead generation', 'negotiation', 
+    'b2b sales', 'relationship building', 'business analysis', 'sales forecasting', 'strategic planning'
+],
+'soft_skills': [
+    'communication', 'problem solving', 'negotiation', 'relationship building', 'collaboration'
+],
+'education': [
+    'bachelor', 'business administration', 'marketing', 'mba', 'certifications in business development'
+]
+},
+'CEO': {
+'technical_skills': [
+    'strategic planning', 'financial management', 'corporate governance', 'leadership', 'business operations', 
+    'stakeholder management', 'decision making', 'corporate strategy', 'public relations'
+],
+'soft_skills': [
+    'leadership', 'problem solving', 'communication', 'visionary thinking', 'adaptability'
+],
+'education': [
+    'bachelor', 'business administration', 'economics', 'mba', 'executive leadership programs'
+]
+},
+'Vice President': {
+'technical_skills': [
+    'strategic leadership', 'business development', 'financial planning', 'corporate governance', 
+    'project management', 'operations management', 'risk management', 'stakeholder communication'
+],
+'soft_skills': [
+    'leadership', 'negotiation', 'decision making', 'team collaboration', 'communication'
+],
+'education': [
+    'bachelor', 'business administration', 'finance', 'mba', 'leadership programs'
+]
+},
+'Team Leader': {
+'technical_skills': [
+    'project management', 'agile methodologies', 'team collaboration', 'conflict resolution', 
+    'performance tracking', 'task delegation', 'mentorship', 'process improvement'
+],
+'soft_skills': [
+    'leadership', 'communication', 'problem solving', 'team motivation', 'time management'
+],
+'education': [
+    'bachelor', 'business administration', 'management', 'certifications in leadership or team management'
+]
+},
+'Manager': {
+'technical_skills': [
+    'project management', 'budgeting', 'financial planning', 'team leadership', 'performance reviews',
+    'strategic planning', 'resource allocation', 'operations management', 'crm tools', 'marketing strategies'
+],
+'soft_skills': [
+    'communication', 'decision making', 'problem solving', 'leadership', 'team collaboration'
+],
+'education': [
+    'bachelor', 'business administration', 'management', 'mba', 'certifications in project management'
+]
+},
+'Sales Consultant': {
+'technical_skills': [
+    'sales techniques', 'crm systems', 'sales strategies', 'market research', 'product knowledge', 
+    'customer engagement', 'lead generation', 'b2b sales', 'negotiation skills'
+],
+'soft_skills': [
+    'communication', 'persuasion', 'problem solving', 'customer service', 'relationship building'
+],
+'education': [
+    'bachelor', 'business administration', 'marketing', 'sales management', 'certifications in sales or marketing'
+]
+},
+'Human Resources Manager': {
+'technical_skills': [
+    'recruitment', 'employee relations', 'hr management software', 'payroll systems', 'labor law',
+    'training and development', 'performance management', 'compliance management'
+],
+'soft_skills': [
+    'communication', 'problem solving', 'leadership', 'conflict resolution', 'empathy'
+],
+'education': [
+    'bachelor', 'human resources', 'business administration', 'mba in human resources', 'certifications in HR management'
+]
+},
+'Digital Transformation Manager': {
+'technical_skills': [
+    'change management', 'cloud computing', 'data analytics', 'digital strategy', 'ai implementation',
+    'business process reengineering', 'automation', 'project management'
+],
+'soft_skills': [
+    'leadership', 'communication', 'adaptability', 'problem solving', 'collaboration'
+],
+'education': [
+    'bachelor', 'business administration', 'digital transformation', 'mba in digital innovation'
+]
+},
+'Scrum Master': {
+'technical_skills': [
+    'agile methodologies', 'scrum framework', 'project management', 'team collaboration', 'product backlog management',
+    'sprint planning', 'jira', 'kanban', 'scrum ceremonies'
+],
+'soft_skills': [
+    'leadership', 'communication', 'problem solving', 'conflict resolution', 'collaboration'
+],
+'education': [
+    'bachelor', 'project management', 'computer science', 'certifications in scrum (CSM)'
+]
+},
+'Frontend Developer': {
+'technical_skills': [
+    'html', 'css', 'javascript', 'react', 'angular', 'vue.js', 'jquery', 'sass', 'responsive design', 
+    'cross-browser compatibility', 'web performance optimization', 'frontend frameworks'
+],
+'soft_skills': [
+    'problem solving', 'creativity', 'attention to detail', 'team collaboration', 'communication'
+],
+'education': [
+    'bachelor', 'computer science', 'software engineering', 'web development', 'certifications in frontend development'
+]
+},
+'Researcher': {
+'technical_skills': [
+    'data analysis', 'research methods', 'statistical analysis', 'qualitative research', 'quantitative research', 
+    'literature review', 'hypothesis testing', 'data visualization', 'survey design', 'research software tools (e.g., SPSS, R)'
+],
+'soft_skills': [
+    'critical thinking', 'problem solving', 'attention to detail', 'communication', 'organization'
+],
+'education': [
+    'bachelor', 'master', 'phd', 'research methodology', 'specialized certifications in research fields'
+]
+}
+}
+
+# Other job titles that share the keyword profile of a listed role
+PROFILE_ALIASES = {
+    'Digital Marketing': 'Digital Marketing Specialist',
+    'WordPress Developer': 'Frontend Developer',
+    'General Researcher': 'Researcher',
+    'Market Researcher': 'Researcher',
+    'Scientific Researcher': 'Researcher',
+}
+
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split lowercased text into word and punctuation tokens"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over word tokens.
+
+    Every keyword of every profile is found in one linear scan of the text.
+    Matching works on whole tokens, so short keywords such as 'r', 'ai' or
+    'ml' only match as separate words, never inside longer ones.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Set[str]] = [set()]
+        for keyword in keywords:
+            self._add(keyword)
+        self._link()
+
+    def _add(self, keyword: str):
+        state = 0
+        for token in _tokenize(keyword):
+            if token not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+                self._goto[state][token] = len(self._goto) - 1
+            state = self._goto[state][token]
+        if state:
+            self._output[state].add(keyword)
+
+    def _link(self):
+        """Compute failure links breadth-first and merge their outputs"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0)
+                self._output[child] |= self._output[self._fail[child]]
+
+    def find(self, text: str) -> Set[str]:
+        """Return every keyword that occurs in the text"""
+        found = set()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for token in _tokenize(text):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
+
+KEYWORD_AUTOMATON = KeywordAutomaton(
+    keyword
+    for categories in KEYWORD_CATEGORIES.values()
+    for keywords in categories.values()
+    for keyword in keywords
+)
+
+
+class ProfileMatrix:
+    """Keyword x (profile, category) incidence matrix.
+
+    Multiplying a resume's keyword vector by the matrix scores every
+    category of every profile in one vectorized step.
+    """
+
+    def __init__(self, keyword_categories: Dict[str, Dict[str, List[str]]]):
+        self.profiles = list(keyword_categories)
+        self.profile_index = {profile: i for i, profile in enumerate(self.profiles)}
+        self.columns = [
+            (profile, category, keywords)
+            for profile, categories in keyword_categories.items()
+            for category, keywords in categories.items()
+        ]
+        self.keywords = sorted({keyword for _, _, keywords in self.columns for keyword in keywords})
+        self._index = {keyword: i for i, keyword in enumerate(self.keywords)}
+
+        self.incidence = np.zeros((len(self.keywords), len(self.columns)), dtype=np.float32)
+        for column, (_, _, keywords) in enumerate(self.columns):
+            for keyword in keywords:
+                self.incidence[self._index[keyword], column] += 1
+        self.column_sizes = np.maximum(self.incidence.sum(axis=0), 1)
+
+        # Averages category scores into one score per profile
+        self.profile_weights = np.zeros((len(self.columns), len(self.profiles)), dtype=np.float32)
+        for column, (profile, _, _) in enumerate(self.columns):
+            self.profile_weights[column, self.profile_index[profile]] = 1 / len(keyword_categories[profile])
+
+    def category_scores(self, found_keywords: Set[str]) -> np.ndarray:
+        """Score every (profile, category) column against the found keywords"""
+        vector = np.zeros(len(self.keywords), dtype=np.float32)
+        vector[[self._index[keyword] for keyword in found_keywords if keyword in self._index]] = 1
+        return (vector @ self.incidence) / self.column_sizes
+
+    def profile_scores(self, found_keywords: Set[str]) -> np.ndarray:
+        """Score every profile as the mean of its category scores"""
+        return self.category_scores(found_keywords) @ self.profile_weights
+
+    def categories(self, profile: str, found_keywords: Set[str],
+                   scoped: Optional[Dict[str, Set[str]]] = None) -> Dict:
+        """Found and missing keywords per category for one profile.
+
+        scoped maps a category to the keywords found in the part of the
+        resume that category is judged on, in place of found_keywords.
+        """
+        results = {}
+        for column_profile, category, keywords in self.columns:
+            if column_profile != profile:
+                continue
+            category_keywords = (scoped or {}).get(category, found_keywords)
+            found = [word for word in keywords if word in category_keywords]
+            missing = [word for word in keywords if word not in category_keywords]
+            results[category] = {
+                'found': found,
+                'missing': missing,
+                'score': len(found) / len(keywords) if keywords else 0
+            }
+        return results
+
+    def best_fit(self, found_keywords: Set[str], preferred: Iterable[str] = ()) -> str:
+        """The best-scoring profile; preferred profiles only break ties between equal scores"""
+        scores = self.profile_scores(found_keywords)
+        tied = [profile for profile, score in zip(self.profiles, scores) if np.isclose(score, scores.max())]
+        preferred = set(preferred)
+        return next((profile for profile in tied if profile in preferred), tied[0])
+
+    def rank(self, found_keywords: Set[str], top_n: int = 5) -> List[Dict]:
+        """Return the top_n best-fit profiles with their category breakdown"""
+        scores = self.profile_scores(found_keywords)
+        best = np.argsort(-scores, kind='stable')[:top_n]
+        return [
+            {
+                'profile': self.profiles[i],
+                'score': round(float(scores[i]), 4),
+                'categories': self.categories(self.profiles[i], found_keywords)
+            }
+            for i in best
+        ]
+
+
+PROFILE_MATRIX = ProfileMatrix(KEYWORD_CATEGORIES)
+
+PROFILE_TITLE_AUTOMATON = KeywordAutomaton(list(KEYWORD_CATEGORIES) + list(PROFILE_ALIASES))
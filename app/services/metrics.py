@@ -0,0 +1,107 @@
+"""Prometheus metrics for per-stage latency, errors, cache hits and queue depth.
+
+Stages run in the API process, in pool worker processes and in every
+gunicorn worker, so prometheus_client runs in multiprocess mode and
+/metrics aggregates all of them. The mode has to be chosen before
+prometheus_client is imported, which is why the directory is set up here.
+
+The first process to import this module owns the directory: it clears the
+files a previous run left in a configured directory, or creates a temporary
+one that it removes on exit. Processes it starts inherit the directory as is.
+"""
+import atexit
+import functools
+import glob
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Tuple
+
+# Set by the owning process so the processes it starts leave the directory alone
+_OWNER_ENV = "RESUME_METRICS_DIR_OWNER"
+
+
+def _remove_owned_dir(path: str, owner: int):
+    # Forked gunicorn workers run atexit handlers too; only the owner removes the directory
+    if os.getpid() == owner:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+if not os.environ.get(_OWNER_ENV):
+    os.environ[_OWNER_ENV] = str(os.getpid())
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        # Values of a previous run would otherwise be summed into this one
+        for stale in glob.glob(os.path.join(os.environ["PROMETHEUS_MULTIPROC_DIR"], "*.db")):
+            os.remove(stale)
+    else:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="resume-metrics-")
+        atexit.register(_remove_owned_dir, os.environ["PROMETHEUS_MULTIPROC_DIR"], os.getpid())
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+from starlette.responses import JSONResponse
+
+# Resume analysis stages take from well under a millisecond to tens of seconds
+STAGE_BUCKETS = (.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60)
+
+STAGE_SECONDS = Histogram(
+    "resume_stage_seconds", "Time spent in each analysis stage", ["stage"], buckets=STAGE_BUCKETS
+)
+STAGE_ERRORS = Counter("resume_stage_errors_total", "Analysis stages that failed", ["stage"])
+REQUEST_SECONDS = Histogram(
+    "resume_request_seconds", "End-to-end request latency", ["endpoint"], buckets=STAGE_BUCKETS
+)
+REQUESTS = Counter("resume_requests_total", "Requests served", ["endpoint", "status"])
+EXTRACTION_FALLBACKS = Counter(
+    "resume_extraction_fallbacks_total", "Extraction backends whose result was not used", ["backend", "reason"]
+)
+OCR_PAGES = Counter("resume_ocr_pages_total", "Scanned pages sent to OCR", ["result"])
+CACHE_LOOKUPS = Counter("resume_cache_lookups_total", "Result cache lookups", ["result"])
+QUEUE_DEPTH = Gauge(
+    "resume_queue_depth", "Requests holding an analysis queue slot", multiprocess_mode="livesum"
+)
+JOBS_RUNNING = Gauge("resume_jobs_running", "Jobs currently being analyzed", multiprocess_mode="livesum")
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Record the duration of a stage, and count it as an error if it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.labels(name).inc()
+        raise
+    finally:
+        STAGE_SECONDS.labels(name).observe(time.perf_counter() - started)
+
+
+def timed(name: str) -> Callable:
+    """Decorator recording every call of a function as a stage"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def json_response(content: Any, status_code: int = 200) -> JSONResponse:
+    """Serialize a result into a response, timed as the serialization stage"""
+    with stage("serialization"):
+        return JSONResponse(content, status_code=status_code)
+
+
+def render() -> Tuple[bytes, str]:
+    """Metrics of every process in the Prometheus text format"""
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int):
+    """Drop the live gauges of an exited worker process"""
+    multiprocess.mark_process_dead(pid)
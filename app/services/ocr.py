@@ -0,0 +1,222 @@
+"""OCR for scanned pages that carry no usable text layer.
+
+Pages whose extracted text is short or garbled and that contain images are
+rendered with PyMuPDF and read by Tesseract through pytesseract, an optional
+dependency. OCR runs on its own bounded thread pool (Tesseract is a
+subprocess, so threads only wait on it) behind its own admission limit, and
+requests hand their analysis queue and job slots back while they wait, so
+OCR-heavy traffic queues there instead of holding up other requests.
+Recognized pages are cached by document hash, page, resolution and
+language, so repeats skip rendering as well as Tesseract.
+"""
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+from app import config
+from app.services.document import DocumentSource, ParsedDocument, read_source, replace_pages
+from app.services.executor import QueueFullError, lend_slots
+from app.services.extraction import PdfData, is_usable
+from app.services.metrics import OCR_PAGES, stage
+from app.services.preview import BoundedBytesCache
+
+
+def _needs_ocr(text: str, min_chars: int) -> bool:
+    return len("".join(text.split())) < min_chars or not is_usable(text)
+
+
+def _digest(data: PdfData) -> str:
+    if not isinstance(data, str):
+        return hashlib.sha256(data).hexdigest()
+    digest = hashlib.sha256()
+    with open(data, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class OcrEngine:
+    """Recognizes scanned pages with Tesseract on a bounded pool of its own"""
+
+    def __init__(self, workers: int, language: str, dpi: int, min_chars: int,
+                 max_pages: int, timeout: int, cache_bytes: int, max_queue: int, retry_after: int):
+        self.workers = workers
+        self.language = language
+        self.dpi = dpi
+        self.min_chars = min_chars
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.cache = BoundedBytesCache(cache_bytes)
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.pending = 0
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._available: Optional[bool] = None
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """Whether OCR is enabled and pytesseract and the tesseract binary are installed"""
+        if self.workers <= 0:
+            return False
+        with self._lock:
+            if self._available is None:
+                try:
+                    import pytesseract
+                    pytesseract.get_tesseract_version()
+                    self._available = True
+                except Exception:
+                    self._available = False
+            return self._available
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="resume-ocr")
+            return self._pool
+
+    def candidates(self, document: ParsedDocument) -> List[int]:
+        """Indexes of extracted pages whose text is too short or garbled to analyze"""
+        pages = [index for index, text in enumerate(document.pages) if _needs_ocr(text, self.min_chars)]
+        return pages[:self.max_pages]
+
+    def render_scanned(self, data: PdfData, indexes: List[int]) -> Dict[int, bytes]:
+        """Grayscale PNGs of the candidate pages that contain images, by page index"""
+        import pymupdf
+        images = {}
+        try:
+            if isinstance(data, str):
+                doc = pymupdf.open(data, filetype="pdf")
+            else:
+                doc = pymupdf.open(stream=data, filetype="pdf")
+        except Exception:
+            return images
+        with doc, stage("ocr_render"):
+            for index in indexes:
+                page = doc[index]
+                # Pages without images are blank or vector-only; Tesseract has nothing to read
+                if not page.get_images(full=False):
+                    continue
+                pixmap = page.get_pixmap(dpi=self.dpi, colorspace=pymupdf.csGRAY, alpha=False)
+                images[index] = pixmap.tobytes("png")
+        return images
+
+    def _key(self, digest: str, index: int) -> Tuple:
+        return (digest, index, self.dpi, self.language)
+
+    def cached(self, digest: str, indexes: List[int]) -> Dict[int, str]:
+        """Text of the pages already recognized, by page index"""
+        texts = {}
+        for index in indexes:
+            cached = self.cache.get(self._key(digest, index))
+            if cached is not None:
+                OCR_PAGES.labels("cached").inc()
+                texts[index] = cached.decode("utf-8")
+        return texts
+
+    def recognize(self, digest: str, index: int, image: bytes) -> Optional[str]:
+        """Text of one rendered page from Tesseract, cached under its document and page; None when OCR fails"""
+        import pytesseract
+        from PIL import Image
+        try:
+            with stage("ocr"):
+                text = pytesseract.image_to_string(
+                    Image.open(BytesIO(image)), lang=self.language, timeout=self.timeout
+                )
+        except Exception:
+            OCR_PAGES.labels("failed").inc()
+            return None
+        OCR_PAGES.labels("recognized").inc()
+        self.cache.set(self._key(digest, index), text.encode("utf-8"))
+        return text
+
+    def _merge(self, document: ParsedDocument, texts: Dict[int, Optional[str]]) -> ParsedDocument:
+        pages = list(document.pages)
+        recognized = []
+        for index, text in sorted(texts.items()):
+            # OCR output replaces the text layer only when it has more to analyze
+            if text and len(text.strip()) > len(pages[index].strip()):
+                pages[index] = text
+                recognized.append(index + 1)
+        if not recognized:
+            return document
+        merged = replace_pages(document, pages)
+        merged.metadata['ocr_pages'] = recognized
+        return merged
+
+    def apply(self, document: ParsedDocument, source: DocumentSource) -> ParsedDocument:
+        """OCR the scanned pages of a document in the calling thread, for offline scoring"""
+        indexes = self.candidates(document)
+        if not indexes or not self.available():
+            return document
+        data = read_source(source)
+        digest = _digest(data)
+        texts = self.cached(digest, indexes)
+        images = self.render_scanned(data, [index for index in indexes if index not in texts])
+        texts.update({index: self.recognize(digest, index, image) for index, image in images.items()})
+        return self._merge(document, texts)
+
+    async def run(self, document: ParsedDocument, source: DocumentSource) -> ParsedDocument:
+        """OCR the scanned pages of a document on the OCR pool, one task per page.
+
+        Pages not in the cache are read under the OCR admission limit, with
+        the request's queue and job slots lent out meanwhile; QueueFullError
+        is raised when too many documents are already waiting for OCR.
+        """
+        indexes = self.candidates(document)
+        if not indexes or not self.available():
+            return document
+        data = read_source(source)
+        digest = _digest(data)
+        texts = self.cached(digest, indexes)
+        missing = [index for index in indexes if index not in texts]
+        if not missing:
+            return self._merge(document, texts)
+
+        if self.pending >= self.max_queue:
+            raise QueueFullError(self.retry_after)
+        self.pending += 1
+        try:
+            async with lend_slots():
+                loop = asyncio.get_running_loop()
+                pool = self._executor()
+                images = await loop.run_in_executor(pool, self.render_scanned, data, missing)
+                recognized = await asyncio.gather(*(
+                    loop.run_in_executor(pool, self.recognize, digest, index, image) for index, image in images.items()
+                ))
+        finally:
+            self.pending -= 1
+        texts.update(zip(images, recognized))
+        return self._merge(document, texts)
+
+    def snapshot(self) -> Dict:
+        """OCR availability and cache usage for health checks"""
+        return {
+            "available": self.available(),
+            "workers": self.workers,
+            "language": self.language,
+            "pending": self.pending,
+            "max_queue": self.max_queue,
+            "cached_bytes": self.cache.size
+        }
+
+    def shutdown(self):
+        """Stop the OCR pool"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+ocr_engine = OcrEngine(
+    workers=config.OCR_WORKERS,
+    language=config.OCR_LANGUAGE,
+    dpi=config.OCR_DPI,
+    min_chars=config.OCR_MIN_CHARS_PER_PAGE,
+    max_pages=config.OCR_MAX_PAGES,
+    timeout=config.OCR_TIMEOUT_SECONDS,
+    cache_bytes=config.OCR_CACHE_BYTES,
+    max_queue=config.OCR_MAX_QUEUE,
+    retry_after=config.RETRY_AFTER_SECONDS
+)
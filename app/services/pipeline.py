@@ -0,0 +1,270 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+from app.services.cache import result_cache
+from app import config
+from app.services.document import (
+    DocumentSource,
+    ParsedDocument,
+    check_page_limit,
+    detect_format,
+    document_source,
+    extract_page_range,
+    merge_page_ranges,
+    parse_docx,
+    parse_document
+)
+from app.services.executor import analysis_executor
+from app.services.extraction import backend_name
+from app.services.jobs import job_queue
+from app.services.keywords import KEYWORD_AUTOMATON
+from app.services.ocr import ocr_engine
+from app.services.resume_service import (
+    ANALYZER_VERSION,
+    analyze_action_verbs,
+    analyze_ats_compatibility,
+    analyze_grammar,
+    analyze_keywords,
+    analyze_page_length,
+    analyze_resume,
+    detect_profile,
+    detect_sections,
+    get_detailed_scores,
+    keyword_match_score,
+    rank_profiles
+)
+from app.services.storage import call_store
+
+
+async def parse_content(content: bytes, backend: Optional[str] = None,
+                        max_pages: Optional[int] = None) -> ParsedDocument:
+    """Parse an uploaded PDF or DOCX in memory, spilling only large uploads to disk.
+
+    PDF pages left without usable text, such as scanned pages, are then
+    read by OCR on its own pool. Word documents carry their text as XML,
+    so they skip page ranges, rendering and OCR.
+    """
+    max_pages = max_pages or config.EXTRACT_MAX_PAGES or None
+    with document_source(content) as source:
+        if detect_format(content) == "docx":
+            return await analysis_executor.run_cpu(parse_docx, source, max_pages)
+        document = await _extract_content(source, backend, max_pages)
+        return await ocr_engine.run(document, source)
+
+
+async def _extract_content(source: DocumentSource, backend: Optional[str],
+                           max_pages: Optional[int]) -> ParsedDocument:
+    """Extract the text layer of a document.
+
+    The first RESUME_EXTRACTION_PAGES_PER_TASK pages are parsed first, which
+    also counts the pages and settles the backend; the rest of a long
+    document is split into page ranges extracted in parallel on the process
+    pool. Only the first max_pages pages are extracted when set.
+    """
+    per_task = config.EXTRACTION_PAGES_PER_TASK
+    if per_task <= 0 or analysis_executor.process_workers <= 1:
+        return await analysis_executor.run_cpu(parse_document, source, backend, max_pages)
+
+    head_pages = per_task if max_pages is None else min(per_task, max_pages)
+    head = await analysis_executor.run_cpu(parse_document, source, backend, head_pages)
+    check_page_limit(head.page_count, max_pages)
+    stop = head.page_count if max_pages is None else min(head.page_count, max_pages)
+    if stop <= head_pages:
+        return head
+
+    ranges = await asyncio.gather(*(
+        analysis_executor.run_cpu(
+            extract_page_range, source, head.metadata['extractor'], start, min(start + per_task, stop)
+        )
+        for start in range(head_pages, stop, per_task)
+    ))
+    return merge_page_ranges(head, ranges)
+
+
+async def _basic_analysis(content: bytes, backend: str) -> Dict:
+    document = await parse_content(content, backend)
+    return await analysis_executor.run_io(analyze_resume, document)
+
+
+def detailed_response(basic_analysis: Dict, detailed_scores: Dict) -> Dict:
+    """Combine basic and detailed results into the /analyze-resume response"""
+    return {
+        "detailed_scores": {
+            "total_final_score": detailed_scores["total_final_score"],
+            "grammar_final_score": detailed_scores["grammar_final_score"],
+            "action_final_score": detailed_scores["action_final_score"],
+            "ats_final_score": detailed_scores["ats_final_score"],
+            "keywords_final_score": detailed_scores["keywords_final_score"],
+            "page_length_final_score": detailed_scores["page_length_final_score"]
+        },
+        "analysis_details": basic_analysis,
+        "improvement_suggestions": detailed_scores["suggestions"]
+    }
+
+
+async def _detailed_analysis(content: bytes, backend: str) -> Dict:
+    document = await parse_content(content, backend)
+    basic_analysis = await analysis_executor.run_io(analyze_resume, document)
+    detailed_scores = await analysis_executor.run_cpu(get_detailed_scores, document, basic_analysis)
+    return detailed_response(basic_analysis, detailed_scores)
+
+
+def _cache_key(namespace: str, content: bytes, backend: Optional[str]) -> str:
+    # Backends, page caps and OCR extract different text, so each has its own results
+    pages = config.EXTRACT_MAX_PAGES or "all"
+    ocr = "ocr" if ocr_engine.available() else "no-ocr"
+    return result_cache.key(content, f"{namespace}:{backend_name(backend)}:{pages}:{ocr}", ANALYZER_VERSION)
+
+
+def _cacheable(result: Dict) -> bool:
+    """Whether a result may be cached; scores computed without LanguageTool are served but not kept"""
+    grammar = result.get("grammar_analysis") or result.get("analysis_details", {}).get("grammar_analysis") or {}
+    return not grammar.get("unavailable")
+
+
+async def _cached(namespace: str, content: bytes, compute: Callable[[bytes, str], Awaitable[Dict]],
+                  admitted: bool, backend: Optional[str]) -> Dict:
+    """Serve a result from the cache, or compute and cache it.
+
+    Cache hits never take a queue slot. Misses take one unless the caller
+    (for example a batch) already holds it.
+    """
+    backend = backend_name(backend)
+    cache_key = _cache_key(namespace, content, backend)
+    cached = await call_store(result_cache.get, cache_key)
+    if cached is not None:
+        return cached
+
+    if admitted:
+        result = await compute(content, backend)
+    else:
+        async with analysis_executor.slot():
+            result = await compute(content, backend)
+    if _cacheable(result):
+        await call_store(result_cache.set, cache_key, result)
+    return result
+
+
+async def basic_analysis(content: bytes, admitted: bool = False, backend: Optional[str] = None) -> Dict:
+    """Basic analysis of a PDF, as returned by /upload"""
+    return await _cached("upload", content, _basic_analysis, admitted, backend)
+
+
+async def detailed_analysis(content: bytes, admitted: bool = False, backend: Optional[str] = None) -> Dict:
+    """Detailed analysis of a PDF, as returned by /analyze-resume"""
+    return await _cached("analyze-resume", content, _detailed_analysis, admitted, backend)
+
+
+async def match_profiles(content: bytes, top_n: int = 5, admitted: bool = False,
+                         backend: Optional[str] = None) -> Dict:
+    """Best-fit job profiles of a PDF, as returned by /match-profiles"""
+    if admitted:
+        document = await parse_content(content, backend)
+        return {"profiles": await analysis_executor.run_cpu(rank_profiles, document, top_n)}
+    async with analysis_executor.slot():
+        return await match_profiles(content, top_n, admitted=True, backend=backend)
+
+
+def _cache_lookup(namespace: str) -> Callable[..., Awaitable[Optional[Dict]]]:
+    async def lookup(content: bytes, backend: Optional[str] = None) -> Optional[Dict]:
+        return await call_store(result_cache.get, _cache_key(namespace, content, backend), count_miss=False)
+    return lookup
+
+
+job_queue.register("upload", basic_analysis, _cache_lookup("upload"))
+job_queue.register("analyze-resume", detailed_analysis, _cache_lookup("analyze-resume"))
+job_queue.register("match-profiles", match_profiles)
+
+
+def _sections_event(document: ParsedDocument) -> Dict:
+    sections = detect_sections(document)
+    return {"sections_found": [name for name, found in sections.items() if found]}
+
+
+def _page_length_event(document: ParsedDocument) -> Dict:
+    analysis = analyze_page_length(document)
+    return {"page_length_final_score": round(analysis["score"] * 100, 2), "message": analysis["message"]}
+
+
+def _ats_event(document: ParsedDocument) -> Dict:
+    analysis = analyze_ats_compatibility(document)
+    return {"ats_final_score": round(analysis["score"] * 100, 2), "issues": analysis["issues"]}
+
+
+def _action_event(document: ParsedDocument) -> Dict:
+    analysis = analyze_action_verbs(document)
+    return {
+        "action_final_score": round(analysis["score"] * 100, 2),
+        "found": analysis["found_verbs"],
+        "missing": analysis["missing_verbs"]
+    }
+
+
+def _keywords_event(document: ParsedDocument) -> Dict:
+    found_keywords = KEYWORD_AUTOMATON.find(document.text)
+    job_profile = detect_profile(document, found_keywords)
+    keyword_analysis = analyze_keywords(document, job_profile, found_keywords)
+    return {
+        "keywords_final_score": round(keyword_match_score(keyword_analysis) * 100, 2),
+        "job_profile": job_profile,
+        "missing": {cat: data['missing'] for cat, data in keyword_analysis.items() if data['missing']}
+    }
+
+
+# Sub-scores that finish in milliseconds and are streamed before grammar
+FAST_EVENTS = [
+    ("sections", _sections_event),
+    ("page_length_final_score", _page_length_event),
+    ("ats_final_score", _ats_event),
+    ("action_final_score", _action_event),
+    ("keywords_final_score", _keywords_event),
+]
+
+SCORE_EVENTS = [
+    "page_length_final_score",
+    "ats_final_score",
+    "action_final_score",
+    "keywords_final_score",
+    "grammar_final_score",
+]
+
+
+async def progressive_analysis(content: bytes, backend: Optional[str] = None) -> AsyncIterator[Tuple[str, Dict]]:
+    """Detailed analysis yielding (event, payload) pairs as each sub-score is ready.
+
+    Grammar starts first but is reported last; the final "complete" event
+    carries the same response as /analyze-resume.
+    """
+    cache_key = _cache_key("analyze-resume", content, backend)
+    cached = await call_store(result_cache.get, cache_key)
+    if cached is not None:
+        for name in SCORE_EVENTS:
+            yield name, {name: cached["detailed_scores"][name]}
+        yield "complete", cached
+        return
+
+    document = await parse_content(content, backend)
+    yield "document", {"page_count": document.page_count, "extractor": document.metadata["extractor"]}
+
+    grammar_task = asyncio.ensure_future(analysis_executor.run_io(analyze_grammar, document))
+    try:
+        async def fast_event(name, func):
+            return name, await analysis_executor.run_cpu(func, document)
+
+        for next_event in asyncio.as_completed([fast_event(name, func) for name, func in FAST_EVENTS]):
+            yield await next_event
+
+        grammar_analysis = await grammar_task
+        yield "grammar_final_score", {
+            "grammar_final_score": round(grammar_analysis["score"] * 100, 2),
+            "errors_count": grammar_analysis["errors_count"],
+            "suggestions": grammar_analysis["suggestions"]
+        }
+
+        basic_analysis = await analysis_executor.run_io(analyze_resume, document, grammar_analysis)
+        detailed_scores = await analysis_executor.run_cpu(get_detailed_scores, document, basic_analysis)
+        response = detailed_response(basic_analysis, detailed_scores)
+        if _cacheable(response):
+            await call_store(result_cache.set, cache_key, response)
+        yield "complete", response
+    finally:
+        grammar_task.cancel()
@@ -0,0 +1,201 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import pymupdf
+from collections import OrderedDict
+from io import BytesIO
+from PIL import Image
+from typing import List, Optional, Tuple
+from app import config
+
+
+class PreviewError(Exception):
+    """Raised when a preview cannot be rendered"""
+
+
+class PageNotFoundError(PreviewError):
+    """Raised when a requested page is outside the document"""
+
+
+# Image formats pages can be rendered to, with their media types
+IMAGE_FORMATS = {"jpeg": "image/jpeg", "webp": "image/webp"}
+
+
+class BoundedBytesCache:
+    """LRU cache of byte strings bounded by their total size"""
+    blocking = False
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+            return image
+
+    def set(self, key: tuple, image: bytes):
+        if len(image) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.size -= len(self._entries.pop(key))
+            self._entries[key] = image
+            self.size += len(image)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+_DOCUMENT_HASH = re.compile(r"[0-9a-f]{64}")
+
+
+class DiskDocumentStore:
+    """PDFs kept as files named by their hash, so every worker process can serve their pages.
+
+    Least recently used files are deleted once the directory holds more than
+    max_bytes.
+    """
+    blocking = True
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, doc_hash: str) -> Optional[str]:
+        # Hashes come from URLs, so anything but a SHA-256 hex digest is unknown
+        if not _DOCUMENT_HASH.fullmatch(doc_hash):
+            return None
+        return os.path.join(self.directory, f"{doc_hash}.pdf")
+
+    def get(self, doc_hash: str) -> Optional[bytes]:
+        path = self._path(doc_hash)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as handle:
+                content = handle.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return content
+
+    def set(self, doc_hash: str, content: bytes):
+        path = self._path(doc_hash)
+        if path is None or len(content) > self.max_bytes:
+            return
+        # Written under a temporary name so other workers never read a partial file
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(content)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        self._evict()
+
+    def _evict(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pdf"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        size = sum(file_size for _, file_size, _ in files)
+        for _, file_size, path in sorted(files):
+            if size <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            size -= file_size
+
+
+# Rendered page images, and the uploaded PDFs that per-page requests render from.
+# Documents go to PREVIEW_DOCUMENT_DIR when set, so they are shared by every worker.
+page_cache = BoundedBytesCache(config.PREVIEW_CACHE_BYTES)
+document_store = (
+    DiskDocumentStore(config.PREVIEW_DOCUMENT_DIR, config.PREVIEW_DOCUMENT_STORE_BYTES)
+    if config.PREVIEW_DOCUMENT_DIR else BoundedBytesCache(config.PREVIEW_DOCUMENT_STORE_BYTES)
+)
+
+
+def document_hash(content: bytes) -> str:
+    """Content hash identifying a document in the page cache"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def count_pages(content: bytes) -> int:
+    """Number of pages in a PDF"""
+    try:
+        with pymupdf.open(stream=content, filetype="pdf") as doc:
+            return doc.page_count
+    except Exception as e:
+        raise PreviewError(f"Error reading PDF: {str(e)}")
+
+
+def select_pages(spec: Optional[str], page_count: int, limit: int) -> List[int]:
+    """Turn a page range such as "1-3,5" into at most limit 1-based page numbers"""
+    if not spec:
+        return list(range(1, min(page_count, limit) + 1))
+
+    pages = []
+    for part in spec.split(","):
+        start, _, end = part.strip().partition("-")
+        try:
+            first = int(start)
+            last = int(end) if end else first
+        except ValueError:
+            raise PreviewError(f"Invalid page range: {spec}")
+        for page in range(max(first, 1), min(last, page_count) + 1):
+            if page not in pages:
+                pages.append(page)
+    return pages[:limit]
+
+
+def render_page(content: bytes, page: int, dpi: int, width: Optional[int], image_format: str = "jpeg") -> bytes:
+    """Render one 1-based page as JPEG or WebP at the given DPI, or scaled to a pixel width"""
+    try:
+        with pymupdf.open(stream=content, filetype="pdf") as doc:
+            if not 1 <= page <= doc.page_count:
+                raise PageNotFoundError(f"Page {page} not found")
+            pdf_page = doc[page - 1]
+            if width:
+                zoom = width / pdf_page.rect.width
+            else:
+                zoom = dpi / 72
+            pixmap = pdf_page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+            if image_format == "jpeg":
+                return pixmap.tobytes("jpeg", jpg_quality=80)
+            image = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+            buffer = BytesIO()
+            image.save(buffer, format="WEBP", quality=80)
+            return buffer.getvalue()
+    except PreviewError:
+        raise
+    except Exception as e:
+        raise PreviewError(f"Error rendering page {page}: {str(e)}")
+
+
+def cache_key(doc_hash: str, page: int, dpi: int, width: Optional[int], image_format: str = "jpeg") -> Tuple:
+    """Page cache key; width takes precedence over DPI when given"""
+    return (doc_hash, page, None if width else dpi, width, image_format)
+
+
+def etag(key: Tuple) -> str:
+    """Strong ETag for a rendered page; the image never changes for a given key"""
+    doc_hash, page, dpi, width, image_format = key
+    size = f"w{width}" if width else f"d{dpi}"
+    return f'"{doc_hash[:32]}-{page}-{size}-{image_format}"'
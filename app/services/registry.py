@@ -0,0 +1,74 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident memory of this process, where the platform exposes it"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _Component:
+    def __init__(self, loader: Callable[[], Any]):
+        self.loader = loader
+        self.value = None
+        self.loaded = False
+        self.load_seconds: Optional[float] = None
+        self.memory_bytes: Optional[int] = None
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """Loads heavy components (NLP models, LanguageTool servers) on first use.
+
+    Components that no analyzer asks for are never loaded. warm_up() loads a
+    chosen set ahead of time, and diagnostics() reports how long each load
+    took and roughly how much memory it added to this process.
+    """
+
+    def __init__(self):
+        self._components: Dict[str, _Component] = {}
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """Register a loader to run the first time the component is needed"""
+        self._components[name] = _Component(loader)
+
+    def get(self, name: str) -> Any:
+        """Return a component, loading it on first use"""
+        component = self._components[name]
+        if not component.loaded:
+            with component.lock:
+                if not component.loaded:
+                    rss_before = _rss_bytes()
+                    started = time.perf_counter()
+                    component.value = component.loader()
+                    component.load_seconds = round(time.perf_counter() - started, 3)
+                    rss_after = _rss_bytes()
+                    if rss_before is not None and rss_after is not None:
+                        component.memory_bytes = max(0, rss_after - rss_before)
+                    component.loaded = True
+        return component.value
+
+    def warm_up(self, names: Iterable[str]):
+        """Load the named components now instead of on first use"""
+        for name in names:
+            self.get(name)
+
+    def diagnostics(self) -> Dict:
+        """Load state, load time and memory of every registered component"""
+        return {
+            name: {
+                'loaded': component.loaded,
+                'load_seconds': component.load_seconds,
+                'memory_bytes': component.memory_bytes
+            }
+            for name, component in self._components.items()
+        }
+
+
+model_registry = ModelRegistry()
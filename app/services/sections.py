@@ -0,0 +1,85 @@
+"""Resume section detection by heading.
+
+A heading is a known section title at the start of a line, optionally
+bulleted or numbered, that either stands alone on its line or is followed
+by a separator (colon, bar, tab or a spaced dash) and the first entry.
+Titles inside sentences, or words such as "network" that merely contain
+one, never count. Every heading is found in one pass of a single compiled
+pattern, and a section runs from its heading to the next heading of any
+kind.
+"""
+import re
+from typing import Dict, Iterable, List, NamedTuple
+
+# Sections whose spans are reported, with the titles they go by
+SECTION_TITLES: Dict[str, List[str]] = {
+    'education': [
+        'education', 'educational background', 'academic background', 'academic qualifications',
+        'education and training', 'education & training', 'qualifications'
+    ],
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'relevant experience',
+        'employment', 'employment history', 'work history', 'career history', 'internships'
+    ],
+    'skills': [
+        'skills', 'technical skills', 'core skills', 'key skills', 'relevant skills',
+        'skills and tools', 'skills & tools', 'tools and technologies', 'tools & technologies',
+        'core competencies', 'competencies', 'technical proficiencies'
+    ],
+    'projects': [
+        'projects', 'personal projects', 'academic projects', 'selected projects', 'key projects',
+        'side projects'
+    ],
+    'certifications': [
+        'certifications', 'certification', 'certificates', 'licenses', 'licences',
+        'licenses and certifications', 'licenses & certifications', 'certifications and licenses',
+        'certifications & licenses'
+    ],
+}
+
+# Other common headings; they are not reported but end the section before them
+OTHER_TITLES = [
+    'summary', 'professional summary', 'profile', 'objective', 'career objective', 'about me',
+    'contact', 'contact information', 'interests', 'hobbies', 'references', 'awards',
+    'honors', 'honours', 'achievements', 'publications', 'languages', 'volunteering',
+    'volunteer experience', 'activities', 'extracurricular activities'
+]
+
+# The sections every resume is expected to have, used for the completeness score
+CORE_SECTIONS = ('education', 'experience', 'skills')
+
+
+class SectionSpan(NamedTuple):
+    """A detected section: where its heading starts and the text it covers after the title"""
+    name: str
+    heading: int
+    start: int
+    end: int
+
+
+def _alternation(titles: Iterable[str]) -> str:
+    # Longest first, so "work experience" wins over "experience"
+    return "|".join(
+        re.escape(title).replace(r"\ ", r"[ \t]+") for title in sorted(titles, key=len, reverse=True)
+    )
+
+
+_HEADING = re.compile(
+    r"^[ \t]*(?:[-•*▪■◆●>#]+[ \t]*|\d{1,2}[.)][ \t]*)?(?:"
+    + "|".join(f"(?P<{name}>{_alternation(titles)})" for name, titles in SECTION_TITLES.items())
+    + f"|(?P<other>{_alternation(OTHER_TITLES)})"
+    + r")[ \t]*(?:(?:[:|\t]|[-–—](?=[ \t]))[^\n]*)?$",
+    re.I | re.M
+)
+
+
+def find_sections(text: str) -> List[SectionSpan]:
+    """Spans of the known sections in document order; a section may appear more than once"""
+    headings = [(match.lastgroup, match.start(), match.end(match.lastgroup)) for match in _HEADING.finditer(text)]
+    spans = []
+    for index, (name, heading, start) in enumerate(headings):
+        if name == 'other':
+            continue
+        end = headings[index + 1][1] if index + 1 < len(headings) else len(text)
+        spans.append(SectionSpan(name, heading, start, end))
+    return spans
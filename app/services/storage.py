@@ -0,0 +1,38 @@
+"""Pieces shared by the stores that may live on disk: the result cache, job
+records and preview documents.
+
+Stores say whether their calls wait on disk with a `blocking` attribute;
+call_store() runs those calls on a thread so the event loop keeps serving.
+"""
+import asyncio
+import os
+import sqlite3
+from typing import Any, Callable, Optional
+
+
+async def call_store(method: Callable, *args, **kwargs) -> Any:
+    """Call a method of a store, on a thread when its store is blocking"""
+    if method.__self__.blocking:
+        return await asyncio.to_thread(method, *args, **kwargs)
+    return method(*args, **kwargs)
+
+
+class ProcessConnection:
+    """A SQLite connection per process, opened on first use with the store's schema"""
+
+    def __init__(self, db_path: str, schema: str):
+        self.db_path = db_path
+        self.schema = schema
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def get(self) -> sqlite3.Connection:
+        """Connection of this process; connections are never shared across a fork"""
+        if self._db is None or self._pid != os.getpid():
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._pid = os.getpid()
+            # Lets worker processes read while another one writes
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(self.schema)
+            self._db.commit()
+        return self._db
@@ -0,0 +1,45 @@
+"""Compare two benchmark result files.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json [--metric p50_ms]
+
+Prints each function and endpoint found in both files with the baseline and
+candidate values and the candidate/baseline ratio; ratios above 1 are slower.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, Iterator, Tuple
+
+
+def _rows(baseline: Dict, candidate: Dict, metric: str) -> Iterator[Tuple[str, float, float]]:
+    for group in ("functions", "endpoints"):
+        for name, stats in baseline.get(group, {}).items():
+            other = candidate.get(group, {}).get(name)
+            if other is not None and metric in stats and metric in other:
+                yield name, stats[metric], other[metric]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--metric", default="p50_ms", help="Latency statistic to compare (default: p50_ms)")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)
+    with open(args.candidate) as handle:
+        candidate = json.load(handle)
+
+    if baseline.get("corpus", {}).get("seed") != candidate.get("corpus", {}).get("seed"):
+        print("warning: the runs used different corpus seeds", file=sys.stderr)
+
+    print(f"{'benchmark':<28}{'baseline':>12}{'candidate':>12}{'ratio':>8}")
+    for name, before, after in _rows(baseline, candidate, args.metric):
+        ratio = after / before if before else float("inf")
+        print(f"{name:<28}{before:>12.3f}{after:>12.3f}{ratio:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
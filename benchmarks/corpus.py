@@ -0,0 +1,173 @@
+"""Deterministic corpus of synthetic resume PDFs for benchmarking.
+
+The same seed always yields the same documents: 1-5 pages each, laid out
+in one of several styles, with enough text to fill every page. The
+vocabulary is fixed here rather than taken from the keyword lists so the
+corpus does not change when the analyzers do.
+"""
+import random
+from dataclasses import dataclass
+from typing import List
+
+import pymupdf
+
+LAYOUTS = ("single_column", "two_column", "table", "dense")
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 in points
+MARGIN = 48
+
+FIRST_NAMES = ["Jane", "Arjun", "Maria", "Wei", "Fatima", "Lucas", "Aiko", "Kwame", "Olga", "Diego"]
+LAST_NAMES = ["Doe", "Sharma", "Garcia", "Chen", "Khan", "Silva", "Tanaka", "Mensah", "Ivanova", "Lopez"]
+TITLES = [
+    "Data Engineer", "Data Scientist", "Software Engineer", "Product Manager",
+    "DevOps Engineer", "Business Analyst", "Frontend Developer", "Machine Learning Engineer"
+]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Analytics"]
+UNIVERSITIES = ["University of Somewhere", "State College", "Institute of Technology", "City University"]
+DEGREES = ["Bachelor of Science in Computer Science", "Master of Science in Data Science",
+           "Bachelor of Engineering", "MBA", "PhD in Statistics"]
+SKILLS = [
+    "python", "sql", "java", "javascript", "react", "docker", "kubernetes", "aws", "azure",
+    "google cloud", "spark", "hadoop", "kafka", "airflow", "tensorflow", "pytorch", "machine learning",
+    "deep learning", "data visualization", "statistics", "etl", "data modeling", "git", "linux",
+    "agile", "scrum", "communication", "problem solving", "leadership", "teamwork"
+]
+VERBS = [
+    "Developed", "Implemented", "Managed", "Improved", "Created", "Launched", "Coordinated",
+    "Designed", "Led", "Built", "Reduced", "Increased", "Automated", "Migrated", "Supervised"
+]
+OBJECTS = [
+    "data pipelines", "a customer analytics platform", "the release process", "REST APIs",
+    "dashboards for executives", "a recommendation model", "the CI/CD workflow", "cloud infrastructure",
+    "a reporting warehouse", "onboarding documentation", "the mobile checkout flow", "monitoring alerts"
+]
+OUTCOMES = [
+    "cutting processing time by {n}%", "serving {n} thousand daily users", "saving {n} engineering hours a month",
+    "improving accuracy by {n} points", "for a team of {n} engineers", "across {n} business units"
+]
+# Sprinkled in so the grammar checker has something to report
+TYPOS = ["teh", "recieved", "seperate", "occured", "managment"]
+
+
+@dataclass
+class CorpusDocument:
+    name: str
+    layout: str
+    pages: int
+    content: bytes
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+
+def _bullet(rng: random.Random) -> str:
+    sentence = f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)} and {rng.choice(SKILLS)}, "
+    sentence += rng.choice(OUTCOMES).format(n=rng.randint(2, 90)) + "."
+    if rng.random() < 0.15:
+        words = sentence.split()
+        words[rng.randrange(1, len(words))] = rng.choice(TYPOS)
+        sentence = " ".join(words)
+    return sentence
+
+
+def _sections(rng: random.Random, name: str, title: str) -> List[str]:
+    """Resume text as a list of paragraphs, long enough to fill several pages"""
+    paragraphs = [
+        name.upper(),
+        f"{title} | {name.split()[0].lower()}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        "SUMMARY",
+        f"{title} with {rng.randint(2, 15)} years of experience. " + " ".join(_bullet(rng) for _ in range(2)),
+        "EXPERIENCE",
+    ]
+    for _ in range(rng.randint(3, 6)):
+        start = rng.randint(2005, 2020)
+        paragraphs.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} ({start} - {start + rng.randint(1, 4)})")
+        paragraphs.extend(f"- {_bullet(rng)}" for _ in range(rng.randint(3, 7)))
+    paragraphs.append("PROJECTS")
+    paragraphs.extend(f"- {_bullet(rng)}" for _ in range(rng.randint(2, 5)))
+    paragraphs.append("EDUCATION")
+    paragraphs.extend(f"{rng.choice(DEGREES)}, {rng.choice(UNIVERSITIES)}" for _ in range(rng.randint(1, 2)))
+    paragraphs.append("SKILLS")
+    paragraphs.append(", ".join(rng.sample(SKILLS, rng.randint(8, 16))))
+    return paragraphs
+
+
+def _fits(rect, text: str, fontsize: float) -> bool:
+    # Measured on a throwaway page so nothing is left behind on the real one
+    scratch = pymupdf.open()
+    try:
+        page = scratch.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        return page.insert_textbox(rect, text, fontsize=fontsize, fontname="helv") >= 0
+    finally:
+        scratch.close()
+
+
+def _fill(page, rect, paragraphs: List[str], start: int, fontsize: float) -> int:
+    """Write as many paragraphs from index start as fit in rect and return the first one left over"""
+    low, high = start, len(paragraphs)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if _fits(rect, "\n".join(paragraphs[start:middle]), fontsize):
+            low = middle
+        else:
+            high = middle - 1
+    if low > start:
+        page.insert_textbox(rect, "\n".join(paragraphs[start:low]), fontsize=fontsize, fontname="helv")
+    return low
+
+
+def _render_page(doc, layout: str, paragraphs: List[str], start: int, rng: random.Random) -> int:
+    page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    body = pymupdf.Rect(MARGIN, MARGIN, PAGE_WIDTH - MARGIN, PAGE_HEIGHT - MARGIN)
+
+    if layout == "two_column":
+        sidebar = pymupdf.Rect(body.x0, body.y0, body.x0 + 150, body.y1)
+        page.draw_rect(sidebar, color=(0.85, 0.85, 0.85), fill=(0.95, 0.95, 0.95))
+        skills = "SKILLS\n" + "\n".join(rng.sample(SKILLS, 12))
+        page.insert_textbox(sidebar + (6, 6, -6, -6), skills, fontsize=9, fontname="helv")
+        return _fill(page, pymupdf.Rect(sidebar.x1 + 16, body.y0, body.x1, body.y1), paragraphs, start, 10)
+
+    if layout == "table":
+        # A grid of skill cells on top, flowing text below
+        cell_width, cell_height = (body.width) / 4, 18
+        for index, skill in enumerate(rng.sample(SKILLS, 12)):
+            row, column = divmod(index, 4)
+            cell = pymupdf.Rect(
+                body.x0 + column * cell_width, body.y0 + row * cell_height,
+                body.x0 + (column + 1) * cell_width, body.y0 + (row + 1) * cell_height
+            )
+            page.draw_rect(cell, color=(0, 0, 0), width=0.5)
+            page.insert_textbox(cell + (4, 3, -4, 0), skill, fontsize=8, fontname="helv")
+        return _fill(page, pymupdf.Rect(body.x0, body.y0 + 3 * cell_height + 12, body.x1, body.y1),
+                     paragraphs, start, 10)
+
+    fontsize = 7 if layout == "dense" else 10.5
+    return _fill(page, body, paragraphs, start, fontsize)
+
+
+def make_document(index: int, seed: int = 0) -> CorpusDocument:
+    """Build the index-th document of the corpus for a seed"""
+    rng = random.Random(f"{seed}:{index}")
+    layout = LAYOUTS[index % len(LAYOUTS)]
+    pages = rng.randint(1, 5)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    title = rng.choice(TITLES)
+
+    paragraphs: List[str] = []
+    doc = pymupdf.open()
+    doc.set_metadata({"title": f"Resume {index}", "producer": "benchmarks.corpus", "creator": "benchmarks.corpus"})
+    position = 0
+    for _ in range(pages):
+        # Keep generating text so every page is full, which is the large-volume case
+        while len(paragraphs) - position < 80:
+            paragraphs.extend(_sections(rng, name, title))
+        position = _render_page(doc, layout, paragraphs, position, rng)
+    content = doc.tobytes(garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+    return CorpusDocument(name=f"resume-{seed}-{index:04d}-{layout}.pdf", layout=layout, pages=pages, content=content)
+
+
+def generate_corpus(count: int, seed: int = 0) -> List[CorpusDocument]:
+    """Build count documents, cycling through every layout"""
+    return [make_document(index, seed) for index in range(count)]
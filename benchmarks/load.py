@@ -0,0 +1,213 @@
+"""In-process load generator with concurrency sweeps.
+
+Usage:
+    python -m benchmarks.load -o load.json
+    python -m benchmarks.load --levels 1,4,16,64 --requests 200 --endpoints /api/v1/analyze-resume
+    RESUME_PROCESS_WORKERS=8 LANGUAGE_TOOL_POOL_SIZE=4 python -m benchmarks.load -o load-8x4.json
+
+Requests go straight to the ASGI app through httpx, with no network and no
+server, so the numbers show the limits of the worker and pool configuration
+taken from the environment. For each endpoint and concurrency level the
+report has throughput, p50/p95/p99 latency, status codes and the peak RSS of
+the process and its pool workers. The saturation point is the lowest level
+whose throughput is within 5% of the best one.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from benchmarks.corpus import CorpusDocument, generate_corpus
+from benchmarks.run import percentile
+
+ENDPOINTS = ["/api/v1/upload", "/api/v1/analyze-resume", "/preview/"]
+LEVELS = [1, 2, 4, 8, 16, 32]
+# Levels within this fraction of the best throughput count as saturated
+SATURATION_GAIN = 0.05
+RSS_SAMPLE_SECONDS = 0.05
+
+
+def _children(pid: int) -> List[int]:
+    children = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children") as handle:
+                children.extend(int(child) for child in handle.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def tree_rss_bytes(pid: Optional[int] = None) -> Optional[int]:
+    """Resident memory of a process and all of its descendants, on Linux"""
+    pid = pid or os.getpid()
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total, pending, seen = 0, [pid], set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        try:
+            with open(f"/proc/{current}/statm") as statm:
+                total += int(statm.read().split()[1]) * page_size
+        except (OSError, ValueError, IndexError):
+            if current == pid:
+                return None
+            continue
+        pending.extend(_children(current))
+    return total
+
+
+async def _sample_rss(peak: Dict[str, int], stop: asyncio.Event):
+    while not stop.is_set():
+        rss = tree_rss_bytes()
+        if rss is not None:
+            peak["bytes"] = max(peak["bytes"], rss)
+        try:
+            await asyncio.wait_for(stop.wait(), RSS_SAMPLE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_level(client, path: str, corpus: List[CorpusDocument], concurrency: int, requests: int) -> Dict:
+    """Send requests with at most `concurrency` in flight and summarize them"""
+    latencies: List[float] = []
+    statuses: Dict[int, int] = defaultdict(int)
+    next_request = iter(range(requests))
+
+    async def worker():
+        for index in next_request:
+            doc = corpus[index % len(corpus)]
+            started = time.perf_counter()
+            response = await client.post(path, files={"file": (doc.name, doc.content, "application/pdf")})
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    peak = {"bytes": tree_rss_bytes() or 0}
+    stop = asyncio.Event()
+    sampler = asyncio.ensure_future(_sample_rss(peak, stop))
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await sampler
+
+    succeeded = statuses.get(200, 0)
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(succeeded / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "error_rate": round(1 - succeeded / len(latencies), 4),
+        "peak_rss_mib": round(peak["bytes"] / (1024 * 1024), 1)
+    }
+
+
+def saturation_point(levels: List[Dict]) -> Optional[int]:
+    """Lowest concurrency that reaches the best throughput, within SATURATION_GAIN"""
+    best = max(level["throughput_rps"] for level in levels)
+    if best <= 0:
+        return None
+    for level in levels:
+        if level["throughput_rps"] >= best * (1 - SATURATION_GAIN):
+            return level["concurrency"]
+    return None
+
+
+async def sweep(endpoints: List[str], levels: List[int], requests: int, corpus: List[CorpusDocument]) -> Dict:
+    """Run every endpoint at every concurrency level against the in-process app"""
+    import httpx
+    from app.main import app
+
+    # ASGITransport does not send lifespan events, so run startup and shutdown here
+    await app.router.startup()
+    results = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=None) as client:
+            for path in endpoints:
+                # One unrecorded request so lazy components are loaded before the sweep
+                await run_level(client, path, corpus, 1, 1)
+                runs = []
+                for concurrency in levels:
+                    result = await run_level(client, path, corpus, concurrency, max(requests, concurrency))
+                    runs.append(result)
+                    print(
+                        f"{path} c={concurrency}: {result['throughput_rps']} rps, "
+                        f"p50 {result['p50_ms']} ms, p99 {result['p99_ms']} ms, "
+                        f"errors {result['error_rate']:.1%}, rss {result['peak_rss_mib']} MiB",
+                        file=sys.stderr
+                    )
+                results[path] = {"levels": runs, "saturation_concurrency": saturation_point(runs)}
+    finally:
+        await app.router.shutdown()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the API in process at increasing concurrency")
+    parser.add_argument("-o", "--output", help="JSON file to write results to (default: stdout)")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="Comma-separated endpoints to drive")
+    parser.add_argument("--levels", default=",".join(map(str, LEVELS)),
+                        help="Comma-separated concurrency levels (default: 1,2,4,8,16,32)")
+    parser.add_argument("--requests", type=int, default=64, help="Requests per level (default: 64)")
+    parser.add_argument("--documents", type=int, default=16, help="Documents in the corpus (default: 16)")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed (default: 0)")
+    parser.add_argument("--warm-caches", action="store_true",
+                        help="Keep the result, preview and grammar caches enabled")
+    args = parser.parse_args(argv)
+
+    endpoints = [path for path in args.endpoints.split(",") if path]
+    levels = sorted({int(level) for level in args.levels.split(",") if level})
+    if not endpoints or not levels or levels[0] < 1:
+        parser.error("need at least one endpoint and positive concurrency levels")
+
+    if not args.warm_caches:
+        # Read by app.config at import, so set before anything from app is imported
+        os.environ["RESUME_CACHE_MAX_ENTRIES"] = "0"
+        os.environ["RESUME_CACHE_DB_PATH"] = ""
+        os.environ["GRAMMAR_MEMO_SIZE"] = "0"
+        os.environ["PREVIEW_CACHE_BYTES"] = "0"
+
+    from app import config
+
+    corpus = generate_corpus(max(1, args.documents), args.seed)
+    results = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "cpu_count": os.cpu_count(),
+            "warm_caches": args.warm_caches,
+            "requests_per_level": args.requests,
+            "corpus": {"seed": args.seed, "documents": len(corpus)},
+            "config": {
+                "thread_workers": config.THREAD_WORKERS,
+                "process_workers": config.PROCESS_WORKERS,
+                "max_queue_depth": config.MAX_QUEUE_DEPTH,
+                "job_concurrency": config.JOB_CONCURRENCY,
+                "language_tool_pool_size": config.LANGUAGE_TOOL_POOL_SIZE
+            }
+        },
+        "endpoints": asyncio.run(sweep(endpoints, levels, args.requests, corpus))
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""Latency and memory benchmarks for the analyzers and the HTTP endpoints.
+
+Usage:
+    python -m benchmarks.run -o results.json
+    python -m benchmarks.run --documents 40 --repeat 5 --seed 1 -o results.json
+    python -m benchmarks.compare baseline.json results.json
+
+Every run analyzes the same synthetic corpus (see benchmarks/corpus.py), so
+results from different commits or configurations can be compared directly.
+The result cache and the grammar sentence memo are disabled unless
+--warm-caches is given, so each iteration does the full work.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+from benchmarks.corpus import CorpusDocument, generate_corpus
+
+FUNCTIONS = ["extract_text", "analyze_grammar", "analyze_keywords", "analyze_action_verbs"]
+# Extraction with each backend, without fallbacks to another one
+BACKENDS = ["pymupdf", "pdfplumber", "pypdf2"]
+BACKEND_FUNCTIONS = [f"extract_text[{backend}]" for backend in BACKENDS]
+ENDPOINTS = ["/api/v1/upload", "/api/v1/analyze-resume"]
+
+
+def percentile(samples: List[float], percent: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict:
+    """Latency statistics in milliseconds"""
+    return {
+        "runs": len(samples),
+        "mean_ms": round(statistics.mean(samples) * 1000, 3),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+    }
+
+
+def _peak_rss_kib() -> int:
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def bench_functions(corpus: List[CorpusDocument], repeat: int, names: List[str]) -> Dict:
+    """Time each analyzer on every document, then measure its peak allocation once per document"""
+    from app.services.document import parse_document
+    from app.services.resume_service import (
+        analyze_action_verbs,
+        analyze_grammar,
+        analyze_keywords,
+        extract_text
+    )
+
+    parsed = {doc.name: parse_document(doc.content) for doc in corpus}
+    calls: Dict[str, Callable[[CorpusDocument], object]] = {
+        "extract_text": lambda doc: extract_text(doc.content),
+        "analyze_grammar": lambda doc: analyze_grammar(parsed[doc.name]),
+        "analyze_keywords": lambda doc: analyze_keywords(parsed[doc.name]),
+        "analyze_action_verbs": lambda doc: analyze_action_verbs(parsed[doc.name]),
+    }
+    for backend in BACKENDS:
+        calls[f"extract_text[{backend}]"] = lambda doc, backend=backend: extract_text(doc.content, backend)
+
+    results = {}
+    for name in names:
+        call = calls[name]
+        call(corpus[0])  # warm-up, not recorded
+
+        samples: List[float] = []
+        by_layout: Dict[str, List[float]] = defaultdict(list)
+        for doc in corpus:
+            for _ in range(repeat):
+                started = time.perf_counter()
+                call(doc)
+                elapsed = time.perf_counter() - started
+                samples.append(elapsed)
+                by_layout[doc.layout].append(elapsed)
+
+        # Measured separately because tracing allocations slows every call down
+        peaks = []
+        for doc in corpus:
+            tracemalloc.start()
+            call(doc)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        results[name] = {
+            **summarize(samples),
+            "peak_alloc_kib": {
+                "mean": round(statistics.mean(peaks) / 1024, 1),
+                "max": round(max(peaks) / 1024, 1)
+            },
+            "by_layout_mean_ms": {
+                layout: round(statistics.mean(values) * 1000, 3) for layout, values in sorted(by_layout.items())
+            }
+        }
+        print(f"{name}: p50 {results[name]['p50_ms']} ms, p95 {results[name]['p95_ms']} ms", file=sys.stderr)
+    return results
+
+
+def bench_endpoints(corpus: List[CorpusDocument], repeat: int, paths: List[str]) -> Dict:
+    """Time end-to-end requests through the ASGI app, without a network"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    results = {}
+    with TestClient(app) as client:
+        for path in paths:
+            def post(doc: CorpusDocument):
+                return client.post(path, files={"file": (doc.name, doc.content, "application/pdf")})
+
+            post(corpus[0])  # warm-up, not recorded
+            rss_before = _peak_rss_kib()
+            samples: List[float] = []
+            statuses: Dict[int, int] = defaultdict(int)
+            for doc in corpus:
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    response = post(doc)
+                    samples.append(time.perf_counter() - started)
+                    statuses[response.status_code] += 1
+
+            results[path] = {
+                **summarize(samples),
+                "throughput_rps": round(len(samples) / sum(samples), 2),
+                "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+                "peak_rss_kib": _peak_rss_kib(),
+                "peak_rss_growth_kib": _peak_rss_kib() - rss_before
+            }
+            print(f"{path}: p50 {results[path]['p50_ms']} ms, p95 {results[path]['p95_ms']} ms", file=sys.stderr)
+    return results
+
+
+def run(documents: int, seed: int, repeat: int, functions: List[str], endpoints: List[str]) -> Dict:
+    """Generate the corpus and run every selected benchmark"""
+    from app import config
+    from app.services import resume_service  # noqa: F401  registers the analyzer components
+    from app.services.registry import model_registry
+
+    started = time.perf_counter()
+    corpus = generate_corpus(documents, seed)
+    corpus_seconds = time.perf_counter() - started
+
+    # Start LanguageTool up front so its boot does not land in the first samples
+    model_registry.warm_up(["language_tool"])
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "config": {
+                "thread_workers": config.THREAD_WORKERS,
+                "process_workers": config.PROCESS_WORKERS,
+                "language_tool_pool_size": config.LANGUAGE_TOOL_POOL_SIZE,
+                "result_cache_entries": config.CACHE_MAX_ENTRIES,
+                "grammar_memo_size": config.GRAMMAR_MEMO_SIZE
+            },
+            "components": model_registry.diagnostics()
+        },
+        "corpus": {
+            "seed": seed,
+            "documents": len(corpus),
+            "repeat": repeat,
+            "pages": sum(doc.pages for doc in corpus),
+            "bytes": sum(doc.size for doc in corpus),
+            "generation_seconds": round(corpus_seconds, 3)
+        },
+        "functions": bench_functions(corpus, repeat, functions),
+        "endpoints": bench_endpoints(corpus, repeat, endpoints) if endpoints else {},
+        "peak_rss_kib": _peak_rss_kib()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume analyzers on a synthetic corpus")
+    parser.add_argument("-o", "--output", help="JSON file to write results to (default: stdout)")
+    parser.add_argument("--documents", type=int, default=20, help="Documents in the corpus (default: 20)")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed (default: 0)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per document (default: 3)")
+    parser.add_argument("--functions", default=",".join(FUNCTIONS + BACKEND_FUNCTIONS),
+                        help="Comma-separated analyzers to time (empty for none)")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS),
+                        help="Comma-separated endpoints to time (empty for none)")
+    parser.add_argument("--warm-caches", action="store_true",
+                        help="Keep the result cache and grammar memo enabled")
+    args = parser.parse_args(argv)
+
+    functions = [name for name in args.functions.split(",") if name]
+    endpoints = [path for path in args.endpoints.split(",") if path]
+    unknown = set(functions) - set(FUNCTIONS) - set(BACKEND_FUNCTIONS)
+    if unknown:
+        parser.error(f"unknown functions: {', '.join(sorted(unknown))}")
+
+    if not args.warm_caches:
+        # Read by app.config at import, so set before anything from app is imported
+        os.environ["RESUME_CACHE_MAX_ENTRIES"] = "0"
+        os.environ["RESUME_CACHE_DB_PATH"] = ""
+        os.environ["GRAMMAR_MEMO_SIZE"] = "0"
+    # Each extract_text[backend] benchmark measures that backend alone
+    os.environ["RESUME_EXTRACTION_FALLBACKS"] = ""
+
+    results = run(max(1, args.documents), args.seed, max(1, args.repeat), functions, endpoints)
+    results["meta"]["warm_caches"] = args.warm_caches
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.services import cache, pipeline
+from app.services.cache import ResultCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(cache, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def test_entries_expire_after_the_ttl(clock):
+    results = ResultCache(max_entries=4, ttl_seconds=60)
+    results.set("a", {"score": 1})
+    clock.value += 59
+    assert results.get("a") == {"score": 1}
+    clock.value += 1
+    assert results.get("a") is None
+    assert results.snapshot()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    results = ResultCache(max_entries=2, ttl_seconds=60)
+    results.set("a", 1)
+    results.set("b", 2)
+    # Reading "a" makes "b" the oldest
+    assert results.get("a") == 1
+    results.set("c", 3)
+    assert results.get("b") is None
+    assert results.get("a") == 1 and results.get("c") == 3
+    assert results.snapshot()["evictions"] == 1
+
+
+def test_sqlite_tier_is_shared_and_expires(tmp_path, clock):
+    path = str(tmp_path / "results.sqlite3")
+    ResultCache(max_entries=4, ttl_seconds=60, db_path=path).set("a", {"score": 1})
+
+    other = ResultCache(max_entries=4, ttl_seconds=60, db_path=path)
+    assert other.blocking
+    assert other.get("a") == {"score": 1}
+    assert other.snapshot()["disk_hits"] == 1
+
+    clock.value += 60
+    assert ResultCache(max_entries=4, ttl_seconds=60, db_path=path).get("a") is None
+
+
+def test_count_miss_false_leaves_the_miss_uncounted():
+    results = ResultCache(max_entries=4, ttl_seconds=60)
+    assert results.get("a", count_miss=False) is None
+    assert results.snapshot()["misses"] == 0
+
+
+@pytest.mark.parametrize("result, cacheable", [
+    ({"grammar_analysis": {"score": 90}}, True),
+    ({"grammar_analysis": {"score": 100, "unavailable": True}}, False),
+    ({"analysis_details": {"grammar_analysis": {"unavailable": True}}}, False),
+    ({"profiles": []}, True),
+])
+def test_results_scored_without_languagetool_are_not_cacheable(result, cacheable):
+    assert pipeline._cacheable(result) is cacheable
+
+
+def test_unavailable_grammar_is_served_but_not_cached(monkeypatch):
+    results = ResultCache(max_entries=4, ttl_seconds=60)
+    monkeypatch.setattr(pipeline, "result_cache", results)
+    calls = []
+
+    async def compute(content, backend):
+        calls.append(content)
+        return {"grammar_analysis": {"unavailable": len(calls) == 1}}
+
+    async def scenario():
+        first = await pipeline._cached("upload", b"%PDF", compute, admitted=True, backend=None)
+        second = await pipeline._cached("upload", b"%PDF", compute, admitted=True, backend=None)
+        third = await pipeline._cached("upload", b"%PDF", compute, admitted=True, backend=None)
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert first["grammar_analysis"]["unavailable"]
+    assert second == third == {"grammar_analysis": {"unavailable": False}}
+    assert len(calls) == 2
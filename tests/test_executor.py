@@ -0,0 +1,106 @@
+import asyncio
+import pymupdf
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.executor import AnalysisExecutor, QueueFullError, analysis_executor, holding, lend_slots
+
+
+def _executor(max_queue_depth=2):
+    return AnalysisExecutor(thread_workers=1, process_workers=0, max_queue_depth=max_queue_depth, retry_after=3)
+
+
+def test_acquire_rejects_past_the_queue_depth():
+    executor = _executor(max_queue_depth=2)
+    executor.acquire()
+    executor.acquire()
+    with pytest.raises(QueueFullError) as error:
+        executor.acquire()
+    assert error.value.retry_after == 3 and executor.pending == 2
+    executor.release()
+    executor.acquire()
+    assert executor.pending == 2
+
+
+def test_slot_is_released_when_the_request_fails():
+    async def scenario():
+        executor = _executor(max_queue_depth=1)
+        with pytest.raises(ValueError):
+            async with executor.slot():
+                assert executor.pending == 1
+                raise ValueError("parse failed")
+        assert executor.pending == 0
+        async with executor.slot():
+            with pytest.raises(QueueFullError):
+                async with executor.slot():
+                    pass
+        assert executor.pending == 0
+
+    asyncio.run(scenario())
+
+
+def test_saturated_queue_answers_503_with_retry_after(monkeypatch):
+    document = pymupdf.open()
+    document.new_page().insert_text((72, 72), "A resume nobody has analyzed yet")
+    monkeypatch.setattr(analysis_executor, "pending", analysis_executor.max_queue_depth)
+
+    response = TestClient(app).post("/api/v1/upload", files={"file": ("resume.pdf", document.tobytes())})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(analysis_executor.retry_after)
+    assert analysis_executor.pending == analysis_executor.max_queue_depth
+
+
+def test_lend_slots_gives_back_and_retakes_held_slots():
+    async def scenario():
+        executor = _executor(max_queue_depth=1)
+        semaphore = asyncio.Semaphore(1)
+        async with executor.slot(), semaphore:
+            with holding(semaphore.release, semaphore.acquire):
+                async with lend_slots():
+                    assert executor.pending == 0 and not semaphore.locked()
+                    # Another request is admitted while this one waits
+                    async with executor.slot(), semaphore:
+                        pass
+                assert executor.pending == 1 and semaphore.locked()
+        assert executor.pending == 0 and not semaphore.locked()
+
+    asyncio.run(scenario())
+
+
+def test_lend_slots_leaves_slots_of_other_tasks_alone():
+    async def scenario():
+        executor = _executor()
+        async with executor.slot():
+            async def child():
+                async with lend_slots():
+                    return executor.pending
+            assert await asyncio.ensure_future(child()) == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_lender_keeps_counts_balanced():
+    async def scenario():
+        executor = _executor()
+        semaphore = asyncio.Semaphore(1)
+        waiting = asyncio.Event()
+
+        async def request():
+            async with executor.slot(), semaphore:
+                with holding(semaphore.release, semaphore.acquire):
+                    async with lend_slots():
+                        waiting.set()
+                        await asyncio.sleep(10)
+
+        task = asyncio.ensure_future(request())
+        await waiting.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+        assert executor.pending == 0 and not semaphore.locked()
+        async with semaphore:
+            assert semaphore.locked()
+
+    asyncio.run(scenario())
@@ -0,0 +1,102 @@
+import pytest
+from app import config
+from app.services import extraction
+from app.services.document import DocumentError, parse_document
+from app.services.extraction import ExtractionBackend, backend_chain, is_garbled, is_usable
+
+
+class FakeBackend(ExtractionBackend):
+    """Returns fixed text for a one-page document, or fails to open"""
+
+    def __init__(self, name, text=None):
+        self.name = name
+        self.text = text
+
+    def open(self, data):
+        if self.text is None:
+            raise RuntimeError(f"{self.name} cannot read this PDF")
+        return data
+
+    def page_count(self, doc):
+        return 1
+
+    def page_text(self, doc, index):
+        return self.text
+
+    def page_layout(self, doc, index):
+        return {'width': 612.0, 'height': 792.0, 'rotation': 0}
+
+    def info(self, doc):
+        return {'producer': None, 'creator': None}
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    def install(*fakes):
+        monkeypatch.setattr(extraction, "BACKENDS", {fake.name: fake for fake in fakes})
+        monkeypatch.setattr(config, "EXTRACTION_BACKEND", fakes[0].name)
+        monkeypatch.setattr(config, "EXTRACTION_FALLBACKS", [fake.name for fake in fakes[1:]])
+    return install
+
+
+@pytest.mark.parametrize("text", [
+    "Senior software engineer with 8 years of Python experience.",
+    "Jane Doe\n+1 555 0100\njane@example.com\nExperience 2015-2023",
+    "",
+    "   \n\t",
+])
+def test_readable_text_is_not_garbled(text):
+    assert not is_garbled(text)
+
+
+@pytest.mark.parametrize("text", [
+    "(cid:72)(cid:101)(cid:108)(cid:108)(cid:111)",
+    "Experience (cid:3)(cid:4) at (cid:5)(cid:6)",
+    "\ufffd\ufffd\ufffd resume \ufffd\ufffd",
+    "\ue000\ue001\ue002\ue003 Python",
+    "12/03 45-67 89.10 %% $$ 11 22 33 44",
+])
+def test_broken_font_encodings_are_garbled(text):
+    assert is_garbled(text)
+
+
+def test_blank_text_is_not_usable():
+    assert not is_usable("  \n")
+    assert is_usable("Python developer")
+
+
+def test_chain_starts_with_the_requested_backend(monkeypatch):
+    monkeypatch.setattr(config, "EXTRACTION_BACKEND", "pymupdf")
+    monkeypatch.setattr(config, "EXTRACTION_FALLBACKS", ["pypdf2", "pdfplumber"])
+    assert [backend.name for backend in backend_chain()] == ["pymupdf", "pypdf2", "pdfplumber"]
+    assert [backend.name for backend in backend_chain("pdfplumber")] == ["pdfplumber", "pypdf2"]
+
+
+def test_chain_skips_unknown_fallbacks_and_refuses_unknown_backends(monkeypatch):
+    monkeypatch.setattr(config, "EXTRACTION_FALLBACKS", ["pdfminer", "pypdf2"])
+    assert [backend.name for backend in backend_chain("pymupdf")] == ["pymupdf", "pypdf2"]
+    with pytest.raises(ValueError):
+        backend_chain("pdfminer")
+
+
+def test_garbled_text_falls_back_to_the_next_backend(backends):
+    backends(FakeBackend("first", "(cid:1)(cid:2)(cid:3)"), FakeBackend("second", "Python developer"))
+    document = parse_document(b"%PDF-1.7")
+    assert document.metadata["extractor"] == "second"
+    assert document.text == "Python developer\n"
+
+
+def test_failing_backend_falls_back_in_order(backends):
+    backends(FakeBackend("first"), FakeBackend("second", ""), FakeBackend("third", "Data engineer"))
+    assert parse_document(b"%PDF-1.7").metadata["extractor"] == "third"
+
+
+def test_best_text_is_kept_when_no_backend_reads_cleanly(backends):
+    backends(FakeBackend("first", ""), FakeBackend("second", "\ufffd\ufffd ok"), FakeBackend("third"))
+    assert parse_document(b"%PDF-1.7").metadata["extractor"] == "second"
+
+
+def test_document_error_when_every_backend_fails(backends):
+    backends(FakeBackend("first"), FakeBackend("second"))
+    with pytest.raises(DocumentError, match="second cannot read"):
+        parse_document(b"%PDF-1.7")
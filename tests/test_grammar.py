@@ -0,0 +1,88 @@
+import re
+from types import SimpleNamespace
+import pytest
+from app import config
+from app.services import grammar
+from app.services.grammar import check_text, is_checkable, split_sentences
+
+
+class FakeTool:
+    """Flags every "teh" and records the texts it was sent"""
+
+    def __init__(self):
+        self.requests = []
+
+    def check(self, text):
+        self.requests.append(text)
+        return [
+            SimpleNamespace(offset=match.start(), errorLength=3, message="Possible typo", ruleId="TYPO",
+                            replacements=["the"])
+            for match in re.finditer(r"\bteh\b", text)
+        ]
+
+
+@pytest.fixture
+def tool(monkeypatch):
+    fake = FakeTool()
+    monkeypatch.setattr(grammar.model_registry, "get", lambda name: fake)
+    monkeypatch.setattr(grammar, "_sentence_memo", grammar._SentenceMemo(100))
+    return fake
+
+
+def test_split_sentences_reports_offsets_in_the_text():
+    text = "Led teh team. Shipped the app.\n\nWrote tests for every release."
+    sentences = split_sentences(text)
+    assert [sentence for _, sentence in sentences] == [
+        "Led teh team.", "Shipped the app.", "Wrote tests for every release."
+    ]
+    assert all(text[offset:offset + len(sentence)] == sentence for offset, sentence in sentences)
+
+
+@pytest.mark.parametrize("sentence", [
+    "john.doe@example.com | +1 (555) 123-4567",
+    "Portfolio: https://example.com/projects/resume",
+    "Python, SQL, Docker, AWS, Kubernetes",
+    "Team lead",
+])
+def test_noise_is_not_checkable(sentence):
+    assert not is_checkable(sentence)
+
+
+def test_prose_and_long_list_items_are_checkable():
+    assert is_checkable("Designed the billing service used by every customer.")
+    assert is_checkable("Built dashboards, wrote the data pipelines that feed them, and trained analysts")
+
+
+def test_match_offsets_refer_to_the_original_text(tool):
+    text = "Jane Doe\nManaged teh budget for three teams. Reduced costs by teh end of the year.\n\nMentored teh new hires on code review."
+    matches = check_text(text)
+    assert len(matches) == 3
+    assert [text[match.offset:match.offset + match.length] for match in matches] == ["teh"] * 3
+    assert matches[0].replacements == ("the",)
+
+
+def test_offsets_survive_chunking(tool, monkeypatch):
+    monkeypatch.setattr(config, "GRAMMAR_CHUNK_CHARS", 40)
+    text = "\n".join(f"Sentence {i} mentions teh project scope." for i in range(6))
+    matches = check_text(text)
+    assert len(tool.requests) > 1
+    assert [text[match.offset:match.offset + match.length] for match in matches] == ["teh"] * 6
+
+
+def test_uncheckable_sentences_are_not_sent(tool):
+    text = "john.doe@example.com | +1 (555) 123-4567\nPython, SQL, Docker, AWS\nFixed teh release process for the team."
+    matches = check_text(text)
+    assert tool.requests == ["Fixed teh release process for the team."]
+    assert [text[match.offset:match.offset + match.length] for match in matches] == ["teh"]
+
+
+def test_repeated_sentences_are_checked_once(tool):
+    sentence = "Worked on teh payments platform."
+    text = f"{sentence}\nSomething else entirely was done here.\n{sentence}"
+    matches = check_text(text)
+    assert "".join(tool.requests).count(sentence) == 1
+    assert [match.offset for match in matches] == [10, text.rindex(sentence) + 10]
+
+    tool.requests.clear()
+    assert check_text(text) == matches
+    assert tool.requests == []
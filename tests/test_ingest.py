@@ -0,0 +1,94 @@
+import asyncio
+import zipfile
+from io import BytesIO
+import pytest
+from fastapi import HTTPException, UploadFile
+from app import config
+from app.services.ingest import read_upload
+
+
+class CountingFile(BytesIO):
+    """Records how many bytes the upload reader pulled"""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.consumed = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+def _read(data, **kwargs):
+    upload = data if isinstance(data, CountingFile) else CountingFile(data)
+    return asyncio.run(read_upload(UploadFile(upload, filename="resume.pdf"), **kwargs))
+
+
+def _docx(document_xml=b"<w:document/>"):
+    package = BytesIO()
+    with zipfile.ZipFile(package, "w", zipfile.ZIP_DEFLATED) as zipped:
+        zipped.writestr("[Content_Types].xml", "<Types/>")
+        zipped.writestr("word/document.xml", document_xml)
+    return package.getvalue()
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(config, "UPLOAD_CHUNK_BYTES", 16)
+
+
+def test_pdf_and_docx_are_recognized_by_content():
+    pdf = b"%PDF-1.7\n" + b"x" * 100
+    assert _read(pdf) == pdf
+    assert _read(_docx()) == _docx()
+
+
+def test_pdf_header_after_leading_junk_is_accepted():
+    pdf = b"\n" * 10 + b"%PDF-1.4\n"
+    assert _read(pdf) == pdf
+
+
+def test_unknown_content_is_refused_after_the_first_chunk(small_chunks):
+    upload = CountingFile(b"MZ" + b"\0" * 1000)
+    with pytest.raises(HTTPException) as error:
+        _read(upload)
+    assert error.value.status_code == 415
+    assert upload.consumed == 16
+
+
+def test_zip_without_a_word_document_is_refused():
+    package = BytesIO()
+    with zipfile.ZipFile(package, "w") as zipped:
+        zipped.writestr("notes.txt", "hello")
+    with pytest.raises(HTTPException) as error:
+        _read(package.getvalue())
+    assert error.value.status_code == 415
+
+
+def test_format_outside_the_endpoint_formats_is_refused():
+    with pytest.raises(HTTPException) as error:
+        _read(_docx(), formats=("pdf",))
+    assert error.value.status_code == 415
+
+
+def test_oversized_upload_is_cut_off_while_reading(small_chunks):
+    upload = CountingFile(b"%PDF-1.7\n" + b"x" * 1000)
+    with pytest.raises(HTTPException) as error:
+        _read(upload, max_bytes=40)
+    assert error.value.status_code == 413
+    assert upload.consumed == 48
+
+
+def test_upload_at_the_limit_is_accepted(small_chunks):
+    pdf = b"%PDF-1.7\n" + b"x" * 31
+    assert _read(pdf, max_bytes=40) == pdf
+
+
+def test_word_document_unpacking_past_the_limit_is_refused(monkeypatch):
+    monkeypatch.setattr(config, "MAX_DOCX_UNPACKED_BYTES", 1000)
+    bomb = _docx(b"<w:document>" + b" " * 5000 + b"</w:document>")
+    assert len(bomb) < 1000
+    with pytest.raises(HTTPException) as error:
+        _read(bomb)
+    assert error.value.status_code == 413
@@ -0,0 +1,156 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.services import jobs
+from app.services.executor import analysis_executor
+from app.services.jobs import (
+    CANCELLED, DONE, QUEUED, RUNNING, JobNotFoundError, JobQueue, MemoryJobStore, SQLiteJobStore
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryJobStore()
+    return SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(jobs, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def _queue(store, concurrency=1, ttl_seconds=60):
+    queue = JobQueue(store, concurrency=concurrency, ttl_seconds=ttl_seconds)
+    started = []
+    release = asyncio.Event()
+
+    async def handler(content, admitted):
+        started.append(content)
+        await release.wait()
+        return {"length": len(content)}
+
+    queue.register("blocking", handler)
+    return queue, started, release
+
+
+def test_cancel_running_job(store):
+    async def scenario():
+        pending = analysis_executor.pending
+        queue, started, _ = _queue(store)
+        job_id = await queue.submit("blocking", b"resume")
+        await asyncio.sleep(0.05)
+        assert started == [b"resume"]
+        assert (await queue.get(job_id))["status"] == RUNNING
+
+        job = await queue.cancel(job_id)
+        await asyncio.sleep(0.05)
+        assert job["status"] == CANCELLED and job["status_code"] == 409
+        assert (await queue.get(job_id))["status"] == CANCELLED
+        assert analysis_executor.pending == pending
+
+    asyncio.run(scenario())
+
+
+def test_cancel_queued_job_never_runs_it(store):
+    async def scenario():
+        queue, started, release = _queue(store, concurrency=1)
+        first = await queue.submit("blocking", b"first")
+        second = await queue.submit("blocking", b"second")
+        await asyncio.sleep(0.05)
+        assert (await queue.get(second))["status"] == QUEUED
+
+        await queue.cancel(second)
+        release.set()
+        await asyncio.sleep(0.05)
+        assert started == [b"first"]
+        assert (await queue.get(first))["status"] == DONE
+        assert (await queue.get(second))["status"] == CANCELLED
+
+    asyncio.run(scenario())
+
+
+def test_cancel_leaves_finished_jobs_alone(store):
+    async def scenario():
+        queue, _, release = _queue(store)
+        release.set()
+        job_id = await queue.submit("blocking", b"resume")
+        await asyncio.sleep(0.05)
+        job = await queue.cancel(job_id)
+        assert job["status"] == DONE and job["result"] == {"length": 6}
+
+    asyncio.run(scenario())
+
+
+def test_cancel_marks_jobs_of_other_workers(store, clock):
+    async def scenario():
+        queue, _, _ = _queue(store)
+        # A job running in another worker process has a record but no local task
+        store.put(JobQueue._record("remote", "blocking", RUNNING, clock.value))
+        assert (await queue.cancel("remote"))["status"] == CANCELLED
+        # Its result arrives after the cancellation and is discarded
+        await queue._finish("remote", DONE, result={"length": 1}, status_code=200)
+        assert (await queue.get("remote"))["status"] == CANCELLED
+
+    asyncio.run(scenario())
+
+
+def test_finished_jobs_expire_after_ttl(store, clock):
+    async def scenario():
+        queue, _, release = _queue(store, ttl_seconds=60)
+        release.set()
+        job_id = await queue.submit("blocking", b"resume")
+        await asyncio.sleep(0.05)
+
+        clock.value += 59
+        assert (await queue.get(job_id))["status"] == DONE
+        clock.value += 2
+        with pytest.raises(JobNotFoundError):
+            await queue.get(job_id)
+
+    asyncio.run(scenario())
+
+
+def test_ttl_counts_from_the_last_update(store, clock):
+    async def scenario():
+        queue, _, release = _queue(store, ttl_seconds=60)
+        job_id = await queue.submit("blocking", b"resume")
+        await asyncio.sleep(0.05)
+        clock.value += 50
+        release.set()
+        await asyncio.sleep(0.05)
+
+        clock.value += 50
+        assert (await queue.get(job_id))["status"] == DONE
+        clock.value += 11
+        with pytest.raises(JobNotFoundError):
+            await queue.get(job_id)
+
+    asyncio.run(scenario())
+
+
+def test_unknown_job(store):
+    async def scenario():
+        queue, _, _ = _queue(store)
+        with pytest.raises(JobNotFoundError):
+            await queue.cancel("missing")
+
+    asyncio.run(scenario())
+
+
+def test_jobs_running_past_the_ttl_are_kept(store, clock):
+    async def scenario():
+        queue, _, release = _queue(store, ttl_seconds=60)
+        job_id = await queue.submit("blocking", b"resume")
+        await asyncio.sleep(0.05)
+
+        clock.value += 120
+        assert (await queue.get(job_id))["status"] == RUNNING
+        release.set()
+        await asyncio.sleep(0.05)
+        job = await queue.get(job_id)
+        assert job["status"] == DONE and job["result"] == {"length": 6}
+
+    asyncio.run(scenario())
@@ -0,0 +1,97 @@
+import pytest
+from app.services.keywords import KEYWORD_AUTOMATON, KEYWORD_CATEGORIES, PROFILE_MATRIX, KeywordAutomaton, ProfileMatrix
+
+CATEGORIES = {
+    'Data Engineer': {
+        'technical_skills': ['python', 'sql', 'spark', 'airflow'],
+        'education': ['bachelor', 'computer science'],
+    },
+    'Designer': {
+        'technical_skills': ['figma', 'sketch'],
+        'education': ['bachelor', 'graphic design'],
+    },
+    'Analyst': {
+        'technical_skills': ['sql', 'excel'],
+        'education': ['bachelor'],
+    },
+}
+
+
+def test_finds_multi_word_keywords():
+    automaton = KeywordAutomaton(['machine learning', 'learning', 'sql'])
+    assert automaton.find("Applied Machine Learning and SQL.") == {'machine learning', 'learning', 'sql'}
+
+
+def test_finds_overlapping_keywords_through_failure_links():
+    automaton = KeywordAutomaton(['data analysis', 'analysis tools'])
+    assert automaton.find("data analysis tools") == {'data analysis', 'analysis tools'}
+
+
+def test_short_keywords_match_whole_tokens_only():
+    automaton = KeywordAutomaton(['r', 'ai', 'ml'])
+    assert automaton.find("Trained brain models in HTML with email campaigns for rails") == set()
+    assert automaton.find("Skills: R, AI and ML") == {'r', 'ai', 'ml'}
+
+
+def test_short_profile_keywords_stay_out_of_words():
+    found = KEYWORD_AUTOMATON.find("Maintained email servers and trained staff on HTML")
+    assert not found & {'r', 'ai', 'ml'}
+
+
+def test_multi_word_keyword_needs_adjacent_tokens():
+    automaton = KeywordAutomaton(['machine learning'])
+    assert automaton.find("machine shop learning") == set()
+
+
+def test_punctuation_inside_keywords():
+    automaton = KeywordAutomaton(['ci/cd', 'c++'])
+    assert automaton.find("Built CI/CD pipelines in C++") == {'ci/cd', 'c++'}
+
+
+def test_categories_lists_found_and_missing_keywords():
+    matrix = ProfileMatrix(CATEGORIES)
+    result = matrix.categories('Data Engineer', {'python', 'sql', 'bachelor', 'figma'})
+    assert result == {
+        'technical_skills': {'found': ['python', 'sql'], 'missing': ['spark', 'airflow'], 'score': 0.5},
+        'education': {'found': ['bachelor'], 'missing': ['computer science'], 'score': 0.5},
+    }
+
+
+def test_categories_uses_scoped_keywords_for_scoped_categories():
+    matrix = ProfileMatrix(CATEGORIES)
+    result = matrix.categories('Data Engineer', {'python', 'bachelor'}, scoped={'education': {'computer science'}})
+    assert result['technical_skills']['found'] == ['python']
+    assert result['education'] == {'found': ['computer science'], 'missing': ['bachelor'], 'score': 0.5}
+
+
+def test_rank_orders_profiles_by_mean_category_score():
+    matrix = ProfileMatrix(CATEGORIES)
+    ranked = matrix.rank({'sql', 'excel', 'bachelor'}, top_n=3)
+    assert [entry['profile'] for entry in ranked] == ['Analyst', 'Data Engineer', 'Designer']
+    assert [entry['score'] for entry in ranked] == [1.0, 0.375, 0.25]
+    assert ranked[0]['categories'] == matrix.categories('Analyst', {'sql', 'excel', 'bachelor'})
+
+
+def test_rank_keeps_profile_order_on_ties_and_honors_top_n():
+    matrix = ProfileMatrix(CATEGORIES)
+    assert [entry['profile'] for entry in matrix.rank(set(), top_n=2)] == ['Data Engineer', 'Designer']
+
+
+@pytest.mark.parametrize('profile', list(KEYWORD_CATEGORIES)[:5])
+def test_matrix_scores_match_per_category_ratios(profile):
+    found = KEYWORD_AUTOMATON.find("Python SQL AWS Docker Kubernetes communication leadership bachelor")
+    categories = PROFILE_MATRIX.categories(profile, found)
+    expected = sum(data['score'] for data in categories.values()) / len(categories)
+    score = PROFILE_MATRIX.profile_scores(found)[PROFILE_MATRIX.profile_index[profile]]
+    assert score == pytest.approx(expected)
+
+
+def test_best_fit_ignores_preferred_profiles_that_fit_worse():
+    matrix = ProfileMatrix(CATEGORIES)
+    assert matrix.best_fit({'sql', 'excel', 'bachelor'}, preferred={'Designer'}) == 'Analyst'
+
+
+def test_best_fit_breaks_ties_with_preferred_profiles():
+    matrix = ProfileMatrix(CATEGORIES)
+    assert matrix.best_fit(set()) == 'Data Engineer'
+    assert matrix.best_fit(set(), preferred={'Designer'}) == 'Designer'
@@ -0,0 +1,60 @@
+import asyncio
+import json
+from app.middleware import BodySizeLimitMiddleware
+
+
+def _call(body_chunks, path="/upload", headers=()):
+    """Send a body in chunks through the middleware around an app that reads it all"""
+    received = []
+    sent = []
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": index < len(body_chunks) - 1}
+        for index, chunk in enumerate(body_chunks)
+    ]
+
+    async def app(scope, receive, send):
+        more_body = True
+        while more_body:
+            message = await receive()
+            received.append(len(message["body"]))
+            more_body = message["more_body"]
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": json.dumps({"size": sum(received)}).encode()})
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = BodySizeLimitMiddleware(app, max_bytes=100, path_limits={"/batch": 1000})
+    scope = {"type": "http", "path": path, "headers": list(headers)}
+    asyncio.run(middleware(scope, receive, send))
+    status = sent[0]["status"]
+    body = json.loads(b"".join(message.get("body", b"") for message in sent[1:]))
+    return status, body, received, dict(sent[0]["headers"])
+
+
+def test_body_within_the_limit_passes():
+    status, body, _, _ = _call([b"x" * 60, b"x" * 40])
+    assert status == 200 and body == {"size": 100}
+
+
+def test_declared_length_over_the_limit_is_refused_unread():
+    status, body, received, headers = _call([b"x" * 101], headers=[(b"content-length", b"101")])
+    assert status == 413
+    assert headers[b"connection"] == b"close"
+    assert "0.0 MB" in body["detail"]
+    assert received == []
+
+
+def test_streamed_body_is_cut_off_when_it_crosses_the_limit():
+    status, _, received, _ = _call([b"x" * 40] * 10)
+    assert status == 413
+    # The chunk that crosses the limit never reaches the app, nor does its response
+    assert received == [40, 40]
+
+
+def test_paths_can_have_their_own_limit():
+    assert _call([b"x" * 250] * 2, path="/batch")[0] == 200
+    assert _call([b"x" * 250] * 5, path="/batch")[0] == 413
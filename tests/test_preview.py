@@ -0,0 +1,31 @@
+import pytest
+from app.services.preview import PreviewError, select_pages
+
+
+def test_no_range_selects_the_first_pages_up_to_the_limit():
+    assert select_pages(None, page_count=3, limit=10) == [1, 2, 3]
+    assert select_pages("", page_count=30, limit=4) == [1, 2, 3, 4]
+
+
+def test_ranges_and_single_pages_keep_their_order():
+    assert select_pages("5,1-3", page_count=10, limit=10) == [5, 1, 2, 3]
+    assert select_pages(" 2 - 4 , 7", page_count=10, limit=10) == [2, 3, 4, 7]
+
+
+def test_repeated_pages_are_selected_once():
+    assert select_pages("1-3,2,3-4", page_count=10, limit=10) == [1, 2, 3, 4]
+
+
+def test_pages_outside_the_document_are_dropped():
+    assert select_pages("0-2,4-9", page_count=5, limit=10) == [1, 2, 4, 5]
+    assert select_pages("8", page_count=5, limit=10) == []
+
+
+def test_selection_is_capped_at_the_limit():
+    assert select_pages("1-100", page_count=100, limit=3) == [1, 2, 3]
+
+
+@pytest.mark.parametrize("spec", ["a", "1-b", "1,,2", "1-2-3"])
+def test_malformed_ranges_are_refused(spec):
+    with pytest.raises(PreviewError):
+        select_pages(spec, page_count=10, limit=10)
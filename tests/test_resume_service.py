@@ -0,0 +1,30 @@
+from app.services.document import ParsedDocument
+from app.services.resume_service import analyze_keywords, detect_profile, rank_profiles
+
+
+def _document(text):
+    return ParsedDocument(text=text, pages=[text], page_count=1)
+
+
+ML_RESUME = _document(
+    "Jane Doe\n"
+    "Machine learning engineer\n"
+    "Experience\n"
+    "Trained deep learning and NLP models in Python with PyTorch and TensorFlow.\n"
+    "Built neural networks for data science teams on cloud platforms.\n"
+    "Presented results to the CEO every quarter.\n"
+    "Education\n"
+    "Master in Computer Science\n"
+)
+
+
+def test_title_mentioned_in_passing_does_not_pick_the_profile():
+    profile = detect_profile(ML_RESUME)
+    assert profile == 'AI/Machine Learning Engineer'
+    assert profile == rank_profiles(ML_RESUME, top_n=1)[0]['profile']
+    assert 'python' in analyze_keywords(ML_RESUME, profile)['technical_skills']['found']
+
+
+def test_headline_title_breaks_ties():
+    document = _document("John Smith\nCivil Engineer\nReferences available on request\n")
+    assert detect_profile(document) == 'Civil Engineer'
@@ -0,0 +1,57 @@
+from app.services.sections import SectionSpan, find_sections
+
+RESUME = (
+    "Jane Doe\n"
+    "Summary\n"
+    "Backend engineer.\n"
+    "Work Experience\n"
+    "Acme Corp, 2019-2024\n"
+    "Education\n"
+    "BSc Computer Science\n"
+    "Skills: Python, SQL\n"
+)
+
+
+def _text(text, span):
+    return text[span.start:span.end]
+
+
+def test_spans_run_from_heading_to_next_heading():
+    spans = find_sections(RESUME)
+    assert [span.name for span in spans] == ['experience', 'education', 'skills']
+    experience, education, skills = spans
+    assert experience.heading == RESUME.index("Work Experience")
+    assert _text(RESUME, experience) == "\nAcme Corp, 2019-2024\n"
+    assert experience.end == education.heading
+    assert _text(RESUME, education) == "\nBSc Computer Science\n"
+    assert education.end == skills.heading
+
+
+def test_inline_entry_after_separator_belongs_to_the_section():
+    skills = find_sections(RESUME)[-1]
+    assert _text(RESUME, skills) == ": Python, SQL\n"
+    assert skills.end == len(RESUME)
+
+
+def test_other_headings_end_the_section_before_them():
+    text = "Experience\nAcme Corp\nReferences\nAvailable on request\n"
+    assert find_sections(text) == [SectionSpan('experience', 0, len("Experience"), text.index("References"))]
+
+
+def test_bulleted_and_numbered_headings():
+    text = "• Education\nBSc\n2. Projects\nCompiler\n"
+    spans = find_sections(text)
+    assert [(span.name, span.heading) for span in spans] == [('education', 0), ('projects', text.index("2. Projects"))]
+    assert _text(text, spans[0]) == "\nBSc\n"
+
+
+def test_titles_inside_sentences_are_not_headings():
+    text = "I gained experience in network skills.\nMy education was in physics.\nNetwork engineering\n"
+    assert find_sections(text) == []
+
+
+def test_repeated_sections_are_each_reported():
+    text = "Experience\nA\nSkills\nB\nExperience\nC\n"
+    spans = find_sections(text)
+    assert [span.name for span in spans] == ['experience', 'skills', 'experience']
+    assert [_text(text, span) for span in spans] == ["\nA\n", "\nB\n", "\nC\n"]